@@ -27,9 +27,13 @@ Ben.Thornton955@cranfield.ac.uk, ben.thornton@astrazeneca.com
 import os
 import sys
 
+from concurrent.futures import ProcessPoolExecutor
+
 from .argument_parser import CustomArgumentParser
 from .file_handler import FileHandler
-from .utils import error, warn
+from .plotting_structured import PER_SAMPLE_SECTIONS
+from .profiling import PROFILER
+from .utils import error, warn, write_as_bytes
 
 
 def main() -> None:
@@ -43,11 +47,22 @@ def main() -> None:
     args, actions = parser.parse_args()
     # actions.append("sn")
 
+    if args.profile or args.profile_json is not None or args.trace is not None:
+        PROFILER.enable()
+
     # Tell my FileHandler instance to only bother
     # parsing the required sections. Saves (a bit of)
     # computation.
     handler = FileHandler(args, actions)
-    sections = handler.parse()
+
+    # A stream (e.g. `bcftools stats ... | VCHKPlotter - out -a`) is
+    # written section by section as it arrives instead, and so is a file
+    # plotted with --jobs, so parsing and plotting overlap. See below.
+    pipelined = handler.reads_stream() or (args.jobs > 1 and not args.text_only)
+    if args.text_only and not pipelined:
+        handler.scan()
+    elif not pipelined:
+        sections = handler.parse()
 
     # Can only make directory and subdirectory simultaneously
     # if out_dir string ends with "/"
@@ -65,29 +80,289 @@ def main() -> None:
         warn(args.verbose,
              "Output folder already exists, program will overwrite.")
 
+    if pipelined:
+        write_sections_as_they_arrive(handler, actions, args)
+        write_profile(args)
+        return
+
+    # Text only? Then copy each section's text straight from the input file,
+    # without parsing or plotting anything.
+    if args.text_only:
+        for action in actions:
+            if make_section_folder(args.out_dir, action):
+                handler.copy_section_text(action, args.out_dir)
+
+        sys.stdout.flush()
+        sys.stdout.buffer.write(handler.read_section_bytes("sn"))
+        sys.stdout.flush()
+        write_profile(args)
+        return
+
     # Now we can loop through all the things the
     # user wants and output this to the correct place...
     for action in actions:
 
-        if not os.path.isdir(f"{args.out_dir}/{action}"):
-            try:
-                os.mkdir(f"{args.out_dir}/{action}")
-            except IOError:
-                error(
-                    "Could not create subfolder. Continuing to next section.")
-                # Only continue, so rest of the output still has a chance of
-                # being written.
-
-                continue
+        if not make_section_folder(args.out_dir, action):
+            # Only continue, so rest of the output still has a chance of
+            # being written.
+            continue
 
         section = sections.get_section(action)
-        section.plot_and_write_file(args.out_dir)
+        section.plot_and_write_file(args.out_dir,
+                                    output_options_for(args, action),
+                                    args.verbose,
+                                    samples_per_page_for(args, action))
 
     # Regardless of the -SN option. Print the summary numbers to stdout.
     for line in sections.get_section("sn").get_text():
         # The raw text contains the line-endings anyway.
         print(line, end="")
 
+    write_profile(args)
+
+
+def make_section_folder(out_dir, action) -> bool:
+    """Creates the subfolder for a section's output, if it does not exist.
+
+    Args:
+        out_dir:
+            The base out directory.
+        action:
+            The name of the section. E.g. "st".
+
+    Returns:
+        Whether the subfolder exists now.
+    """
+
+    if not os.path.isdir(f"{out_dir}/{action}"):
+        try:
+            os.mkdir(f"{out_dir}/{action}")
+        except IOError:
+            error("Could not create subfolder. Continuing to next section.")
+            return False
+
+    return True
+
+
+def output_options_for(args, action) -> dict:
+    """Collects the image format settings for a section's plot.
+
+    Args:
+        args:
+            The parsed command-line arguments.
+        action:
+            The name of the section. E.g. "st".
+
+    Returns:
+        The output options to pass on to the section's `DataPlotter`.
+    """
+
+    file_format, dpi = args.section_formats.get(action, (args.format, None))
+
+    output_options = {
+        "file_format": file_format,
+        "dpi_quality": dpi if dpi is not None else args.dpi,
+        "compression": args.png_compression,
+        "quality": args.quality,
+    }
+
+    if action in PER_SAMPLE_SECTIONS:
+        output_options["max_samples"] = args.max_samples
+        output_options["sample_summary"] = args.sample_summary
+        output_options["cluster_samples"] = args.cluster_samples
+
+    return output_options
+
+
+def samples_per_page_for(args, action):
+    """The number of samples per page to plot a section with.
+
+    Args:
+        args:
+            The parsed command-line arguments.
+        action:
+            The name of the section. E.g. "psc".
+
+    Returns:
+        `--samples-per-page` for per-sample sections, otherwise `None`
+        (not paginated).
+    """
+
+    if action in PER_SAMPLE_SECTIONS:
+        return args.samples_per_page
+
+    return None
+
+
+def write_profile(args) -> None:
+    """Reports the recorded phases, if profiling was asked for.
+
+    Args:
+        args:
+            The parsed command-line arguments.
+    """
+
+    if args.profile:
+        PROFILER.report()
+
+    if args.profile_json is not None:
+        try:
+            PROFILER.write_json(args.profile_json)
+        except IOError:
+            error(f"Could not write to file {args.profile_json}")
+
+    if args.trace is not None:
+        try:
+            PROFILER.write_chrome_trace(args.trace)
+        except IOError:
+            error(f"Could not write to file {args.trace}")
+
+
+def init_plotting_worker(profile=False) -> None:
+    """Runs once in each worker process of the plotting pool.
+
+    Each worker renders off-screen with its own Agg backend.
+
+    Args:
+        profile:
+            Whether to record the phases run in this worker.
+    """
+
+    import matplotlib
+    matplotlib.use("Agg")
+
+    # Forked workers start with a copy of the parent's records.
+    PROFILER.take_records()
+    if profile:
+        PROFILER.enable()
+
+
+def plot_section_in_worker(section, out_dir, output_options, verbose):
+    """Plots and writes a section in a worker process.
+
+    Returns:
+        The profiling records of the worker, so the parent can report them.
+    """
+
+    section.plot_and_write_file(out_dir, output_options, verbose)
+
+    return PROFILER.take_records()
+
+
+def plot_page_in_worker(page, out_dir, output_options, verbose):
+    """Plots and saves one page of a section in a worker process. See
+    `Section.get_pages()`.
+
+    Returns:
+        The profiling records of the worker, so the parent can report them.
+    """
+
+    page.plot_and_save(out_dir, output_options, verbose)
+
+    return PROFILER.take_records()
+
+
+def write_sections_as_they_arrive(handler, actions, args) -> None:
+    """Writes each section as soon as it has been parsed, so plotting
+    starts before the rest of the input has been read.
+
+    The summary numbers are printed to stdout as soon as they arrive. With
+    `--jobs`, each section is handed to a process pool and plotted there
+    while the rest of the input is parsed, so a run takes about as long as
+    the slower of the two rather than both. The figures are the same as the
+    ones written one at a time. If a section fails in its worker, the error
+    is reported here and the other sections are still written.
+
+    A section plotted in pages (`--samples-per-page`) is handed out a page
+    at a time, so its pages are plotted in parallel too. Each page is saved
+    by its worker as soon as it is done, and the index of the pages is
+    written once they all are.
+
+    Args:
+        handler:
+            The `FileHandler` of the input.
+        actions:
+            The sections to output.
+        args:
+            The parsed command-line arguments.
+    """
+
+    out_dir = args.out_dir
+    executor = None
+    if args.jobs > 1 and not args.text_only:
+        executor = ProcessPoolExecutor(max_workers=args.jobs,
+                                       initializer=init_plotting_worker,
+                                       initargs=(PROFILER.is_enabled(),))
+
+    # Only a stream is ever written here in text only mode.
+    sections = handler.stream_sections(parse=False) if args.text_only \
+        else handler.iter_sections()
+
+    # action => [(page or None, future)], and the paginated sections.
+    futures = {}
+    paginated = {}
+    for action, section in sections:
+
+        if action == "sn":
+            sys.stdout.flush()
+            if args.text_only:
+                sys.stdout.buffer.write(section)
+            else:
+                for line in section.get_text():
+                    print(line, end="")
+            sys.stdout.flush()
+
+        if action not in actions or not make_section_folder(out_dir, action):
+            continue
+
+        samples_per_page = samples_per_page_for(args, action)
+
+        if args.text_only:
+            write_as_bytes(out_dir, action, section)
+        elif executor is not None and samples_per_page:
+            section.write_text(out_dir)
+            futures[action] = [
+                (page, executor.submit(plot_page_in_worker,
+                                       page,
+                                       out_dir,
+                                       output_options_for(args, action),
+                                       args.verbose))
+                for page in section.get_pages(samples_per_page)
+            ]
+            paginated[action] = section
+        elif executor is not None:
+            futures[action] = [(None, executor.submit(plot_section_in_worker,
+                                                      section,
+                                                      out_dir,
+                                                      output_options_for(args, action),
+                                                      args.verbose))]
+        else:
+            section.plot_and_write_file(out_dir,
+                                        output_options_for(args, action),
+                                        args.verbose,
+                                        samples_per_page)
+
+    if executor is None:
+        return
+
+    # Collect in submission order so errors are reported consistently.
+    with executor:
+        for action, submitted in futures.items():
+            written = []
+            for page, future in submitted:
+                try:
+                    PROFILER.add_records(future.result())
+                    written.append(page)
+                except Exception as exception:
+                    where = f"page {page.get_page()} of section {action}" \
+                        if page is not None else f"section {action}"
+                    error(
+                        f"Could not output {where} ({exception}). Continuing to next section.")
+
+            if action in paginated:
+                paginated[action].write_page_index(
+                    out_dir, written, output_options_for(args, action))
+
 
 # Entry point to program
 if __name__ == "__main__":
@@ -27,17 +27,44 @@ DATE: Oct16-22.
 LAST REVISED: OCT16-22.
 Ben.Thornton955@cranfield.ac.uk, ben.thornton@astrazeneca.com
 
+Functions:
+    positive_int(value: str) -> int
+
 Classes:
     CustomArgumentParser(argparse.ArgumentParse)
+    BatchArgumentParser(CustomArgumentParser)
 """
 
 import argparse
 
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
+from .compressed_input import DEFAULT_THREADS
+from .plotting_structured import OUTPUT_FORMATS
+from .sample_summary import DEFAULT_MAX_SAMPLES, SUMMARY_MODES
+from .section_cache import DEFAULT_CACHE_SIZE_MB
 from .utils import error, warn
 
 
+def positive_int(value: str) -> int:
+    """`argparse` type for options that only make sense above zero.
+
+    Raises:
+        argparse.ArgumentTypeError: if `value` is not a whole number above zero.
+    """
+
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f"invalid positive int value: {value!r}")
+
+    return number
+
+
 class CustomArgumentParser(argparse.ArgumentParser):
     """Custom `argparse.ArgumentParser`.
 
@@ -116,6 +143,7 @@ class CustomArgumentParser(argparse.ArgumentParser):
         # methods.
         args = super().parse_args()
         self.actions = self._sanity_check_arguments(args)
+        args.section_formats = self._parse_section_formats(args.section_format)
 
         return args, self.actions
 
@@ -129,13 +157,7 @@ class CustomArgumentParser(argparse.ArgumentParser):
         with one another. This will cause the parser to error and exit.
         """
 
-        # Input / output directory arguments
-        self.add_argument("in_dir",
-                          help="location of directory for input data")
-        self.add_argument(
-            "out_dir",
-            help="location of output directory (or where newly created directory should be placed)"
-        )
+        self._add_input_output_arguments()
 
         for available_argument in CustomArgumentParser.AVAILABLE_STANDALONE_ARGUMENTS:
 
@@ -159,6 +181,124 @@ class CustomArgumentParser(argparse.ArgumentParser):
         # Additional ergonomic, quality-of-life arguments
         self.add_argument("--ALL", "-a", action="store_true")
         self.add_argument("--verbose", "-v", action="store_true")
+        self.add_argument(
+            "--format",
+            choices=OUTPUT_FORMATS,
+            default="tiff",
+            help="image format of the plots"
+        )
+        self.add_argument(
+            "--dpi",
+            type=positive_int,
+            default=400,
+            help="resolution of the plots, in dots per inch"
+        )
+        self.add_argument(
+            "--section-format",
+            action="append",
+            default=[],
+            metavar="SECTION=FORMAT[:DPI]",
+            help="image format (and resolution) for one section, e.g. psc=svg or dp=png:150. Can be repeated"
+        )
+        self.add_argument(
+            "--png-compression",
+            type=int,
+            choices=range(10),
+            metavar="{0..9}",
+            help="compression level of PNG plots. Higher is smaller but slower"
+        )
+        self.add_argument(
+            "--quality",
+            type=int,
+            choices=range(1, 101),
+            metavar="{1..100}",
+            help="quality of JPEG and WebP plots"
+        )
+        self.add_argument(
+            "--max-samples",
+            type=int,
+            default=DEFAULT_MAX_SAMPLES,
+            help="per-sample sections (psc, psi) with more samples than this are summarised instead of drawn sample by sample"
+        )
+        self.add_argument(
+            "--sample-summary",
+            choices=SUMMARY_MODES,
+            help="how to summarise per-sample sections with more than --max-samples samples. Heatmap for psc and quantile for psi by default"
+        )
+        self.add_argument(
+            "--cluster-samples",
+            action="store_true",
+            help="put similar samples side by side in per-sample heatmaps, rather than in input order"
+        )
+        self.add_argument(
+            "--samples-per-page",
+            type=positive_int,
+            metavar="N",
+            help="plot per-sample sections (psc, psi) as pages of N samples each, with an index of the pages. Pages are plotted in parallel with --jobs"
+        )
+        self.add_argument(
+            "--text-only",
+            action="store_true",
+            help="only copy the text of each section, without parsing or plotting it"
+        )
+        self.add_argument(
+            "--jobs", "-j",
+            type=positive_int,
+            default=1,
+            help="number of processes to plot sections with, in parallel"
+        )
+        self.add_argument(
+            "--profile",
+            action="store_true",
+            help="print the time and memory taken by each phase of the run to stderr"
+        )
+        self.add_argument(
+            "--profile-json",
+            metavar="FILE",
+            help="write the time and memory taken by each phase of the run to a JSON file"
+        )
+        self.add_argument(
+            "--trace",
+            metavar="FILE",
+            help="write a trace of the run (one span per phase) to a Chrome trace-event JSON file"
+        )
+        self.add_argument(
+            "--index",
+            action="store_true",
+            help="reuse (or write) a <in_dir>.idx index of the input's sections to speed up repeat runs"
+        )
+        self.add_argument(
+            "--cache-dir",
+            help="keep parsed sections in this folder so repeat runs skip parsing"
+        )
+        self.add_argument(
+            "--cache-size",
+            type=int,
+            default=DEFAULT_CACHE_SIZE_MB,
+            help="size limit of the --cache-dir folder in MB. Least recently used sections are removed first"
+        )
+        self.add_argument(
+            "--mmap",
+            action="store_true",
+            help="memory-map the input and parse sections straight from its bytes. Keeps memory use low on very large files"
+        )
+        self.add_argument(
+            "--threads",
+            type=int,
+            default=DEFAULT_THREADS,
+            help="number of threads to decompress BGZF (bgzip) input with"
+        )
+
+    def _add_input_output_arguments(self) -> None:
+        """Adds the positional input / output arguments."""
+
+        # Input / output directory arguments
+        self.add_argument("in_dir",
+                          help="location of directory for input data, or - to read from stdin")
+        self.add_argument(
+            "out_dir",
+            help="location of output directory (or where newly created directory should be placed)"
+        )
 
     def error(self, message):
         """Custom error method for pretty-printing with colour.
@@ -234,6 +374,33 @@ class CustomArgumentParser(argparse.ArgumentParser):
 
             return actions
 
+    def _parse_section_formats(self, section_formats) -> Dict[str, Tuple[str, Optional[int]]]:
+        """Parses the `--section-format SECTION=FORMAT[:DPI]` arguments.
+
+        Errors and exits if any of them is not in that form.
+
+        Returns:
+            A dict of section name => (format, dpi or `None`).
+        """
+
+        sections = [option[0].lower() for option in
+                    CustomArgumentParser.AVAILABLE_STANDALONE_ARGUMENTS]
+
+        parsed = {}
+        for section_format in section_formats:
+            section, _, image_format = section_format.lower().partition("=")
+            image_format, _, dpi = image_format.partition(":")
+
+            if section not in sections or image_format not in OUTPUT_FORMATS:
+                self.error(f"Invalid --section-format {section_format}")
+
+            if dpi and (not dpi.isdigit() or int(dpi) < 1):
+                self.error(f"Invalid DPI in --section-format {section_format}")
+
+            parsed[section] = (image_format, int(dpi) if dpi else None)
+
+        return parsed
+
     def get_actions(self) -> List[str]:
         """Getter for the list of actions extracted from the command line
         arguments by this parser.
@@ -245,3 +412,35 @@ class CustomArgumentParser(argparse.ArgumentParser):
         """
 
         return self.actions
+
+
+class BatchArgumentParser(CustomArgumentParser):
+    """`CustomArgumentParser` for processing many .vchk files in one run.
+
+    Takes the same section flags, but any number of input files, glob
+    patterns or a manifest file instead of a single input file.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        """See `CustomArgumentParser.__init__`."""
+
+        super().__init__(**kwargs)
+        self.description = """Plots sections from many .vchk files
+            and saves their contents to disk, one subfolder per file."""
+
+    def _add_input_output_arguments(self) -> None:
+        """Adds the output directory and the (many) inputs."""
+
+        self.add_argument(
+            "out_dir",
+            help="location of output directory. Each input gets its own subfolder"
+        )
+        self.add_argument(
+            "inputs",
+            nargs="*",
+            help="input .vchk files or glob patterns (quoted), e.g. 'stats/*.vchk'"
+        )
+        self.add_argument(
+            "--manifest",
+            help="file listing one input .vchk file per line"
+        )
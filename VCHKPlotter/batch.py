@@ -0,0 +1,298 @@
+# MIT License
+
+# Copyright (c) 2022 Ben.Thornton955@cranfield.ac.uk (ben.thornton@astrazeneca.com)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Batch script for processing many .vchk files in one run.
+
+The interpreter and the plotting libraries are only started once. Each
+input file is parsed and plotted by a pool of worker processes and its
+output is written to its own subfolder of `out_dir`.
+
+Typical usage example:
+
+    `VCHKPlotter-batch ./output_location 'stats/*.vchk' -a -j 16`
+    `VCHKPlotter-batch ./output_location --manifest files.txt -sn -tstv`
+"""
+
+import copy
+import glob
+import os
+import sys
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional
+
+from .__main__ import (init_plotting_worker, make_section_folder,
+                       output_options_for, samples_per_page_for,
+                       write_profile)
+from .argument_parser import BatchArgumentParser
+from .compressed_input import COMPRESSED_SUFFIXES
+from .file_handler import FileHandler
+from .profiling import PROFILER, phase
+from .utils import error, warn, write_as_bytes, write_as_text
+
+
+def collect_inputs(args) -> List[str]:
+    """Expands the inputs given on the command line into a list of files.
+
+    Args:
+        args:
+            The `argparse.Namespace` from `BatchArgumentParser`.
+
+    Returns:
+        The input files, in the order given and without duplicates.
+    """
+
+    patterns = list(args.inputs)
+
+    if args.manifest is not None:
+        try:
+            with open(args.manifest, "r", encoding="utf-8") as manifest:
+                patterns.extend(
+                    line.strip() for line in manifest
+                    if line.strip() and not line.startswith("#"))
+        except IOError:
+            error(f"Could not read manifest {args.manifest}")
+            sys.exit(1)
+
+    inputs = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                warn(args.verbose, f"No files match {pattern}")
+            inputs.extend(matches)
+        else:
+            inputs.append(pattern)
+
+    return list(dict.fromkeys(inputs))
+
+
+def output_folder_names(inputs) -> List[str]:
+    """Names each input's output subfolder after the input file.
+
+    E.g. "stats/sample1.vchk" or "stats/sample1.vchk.gz" => "sample1".
+    Repeated names are numbered: "sample1", "sample1_2", ...
+
+    Args:
+        inputs:
+            The input files.
+
+    Returns:
+        One subfolder name per input.
+    """
+
+    names = []
+    seen = {}
+    for in_file in inputs:
+        name = os.path.basename(in_file)
+        for suffix in COMPRESSED_SUFFIXES:
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+                break
+        if name.endswith(".vchk"):
+            name = name[:-len(".vchk")]
+
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name}_{seen[name]}")
+
+    return names
+
+
+def process_file(args, actions, in_file, out_dir) -> Optional[str]:
+    """Parses a single .vchk file and writes all of its output.
+
+    Unlike the single-file script, the summary numbers are saved to
+    `<out_dir>/sn/sn.txt` rather than printed to stdout. With
+    `--text-only`, only the text of each section is copied. See
+    `write_text_only`.
+
+    Args:
+        args:
+            The `argparse.Namespace` from `BatchArgumentParser`.
+        actions:
+            The sections to output.
+        in_file:
+            The input .vchk file.
+        out_dir:
+            This input's own output folder.
+
+    Returns:
+        `None` on success, otherwise a description of what went wrong.
+    """
+
+    with phase("file", path=in_file):
+        return write_file_output(args, actions, in_file, out_dir)
+
+
+def write_file_output(args, actions, in_file, out_dir) -> Optional[str]:
+    """Does the work of `process_file`."""
+
+    file_args = copy.copy(args)
+    file_args.in_dir = in_file
+    file_args.out_dir = out_dir
+    actions = list(actions)
+
+    handler = FileHandler(file_args, actions)
+
+    try:
+        if args.text_only and not handler.reads_stream():
+            handler.scan()
+        elif not args.text_only:
+            sections = handler.parse()
+    except SystemExit:
+        return "could not be parsed"
+
+    try:
+        os.makedirs(out_dir, exist_ok=True)
+    except IOError:
+        return "could not create output folder"
+
+    if args.text_only:
+        try:
+            write_text_only(handler, actions, out_dir)
+        except SystemExit:
+            return "could not be read"
+
+        return None
+
+    for action in actions:
+        if not make_section_folder(out_dir, action):
+            continue
+
+        sections.get_section(action).plot_and_write_file(
+            out_dir, output_options_for(args, action), args.verbose,
+            samples_per_page_for(args, action))
+
+    if "sn" not in actions and make_section_folder(out_dir, "sn"):
+        write_as_text(out_dir, "sn", sections.get_section("sn").get_text())
+
+    return None
+
+
+def write_text_only(handler, actions, out_dir) -> None:
+    """Copies the text of each section (and the summary numbers) straight
+    from the input file, without parsing or plotting anything, as the
+    single-file script does with `--text-only`.
+
+    Args:
+        handler:
+            The `FileHandler` of the input. Call `.scan()` on it first,
+            unless it reads a stream.
+        actions:
+            The sections to output.
+        out_dir:
+            This input's own output folder.
+    """
+
+    wanted = set(actions) | {"sn"}
+
+    if handler.reads_stream():
+        for action, data in handler.stream_sections(parse=False):
+            if action in wanted and make_section_folder(out_dir, action):
+                write_as_bytes(out_dir, action, data)
+        return
+
+    for action in actions:
+        if make_section_folder(out_dir, action):
+            handler.copy_section_text(action, out_dir)
+
+    if "sn" not in actions and make_section_folder(out_dir, "sn"):
+        write_as_bytes(out_dir, "sn", handler.read_section_bytes("sn"))
+
+
+def process_file_in_worker(args, actions, in_file, out_dir):
+    """Runs `process_file` in a worker process.
+
+    Returns:
+        The result of `process_file` and the worker's profiling records.
+    """
+
+    problem = process_file(args, actions, in_file, out_dir)
+
+    return problem, PROFILER.take_records()
+
+
+def main() -> None:
+    """Parses command line arguments and outputs the requested sections
+    of every input file."""
+
+    parser = BatchArgumentParser()
+    args, actions = parser.parse_args()
+
+    if args.profile or args.profile_json is not None or args.trace is not None:
+        PROFILER.enable()
+
+    inputs = collect_inputs(args)
+    if not inputs:
+        error("No input files given")
+        sys.exit(1)
+
+    out_dirs = [
+        os.path.join(args.out_dir, name)
+        for name in output_folder_names(inputs)
+    ]
+
+    failures = 0
+
+    if args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs,
+                                 initializer=init_plotting_worker,
+                                 initargs=(PROFILER.is_enabled(),)) as executor:
+
+            futures = {
+                executor.submit(process_file_in_worker, args, actions,
+                                in_file, out_dir): in_file
+                for in_file, out_dir in zip(inputs, out_dirs)
+            }
+
+            for future in as_completed(futures):
+                try:
+                    problem, records = future.result()
+                    PROFILER.add_records(records)
+                except Exception as exception:
+                    problem = str(exception)
+
+                if problem is not None:
+                    failures += 1
+                    error(f"{futures[future]}: {problem}. Continuing to next file.")
+    else:
+        for in_file, out_dir in zip(inputs, out_dirs):
+            try:
+                problem = process_file(args, actions, in_file, out_dir)
+            except Exception as exception:
+                problem = str(exception)
+
+            if problem is not None:
+                failures += 1
+                error(f"{in_file}: {problem}. Continuing to next file.")
+
+    warn(args.verbose,
+         f"Processed {len(inputs) - failures} of {len(inputs)} files.")
+
+    write_profile(args)
+
+    if failures:
+        sys.exit(1)
+
+
+# Entry point to program
+if __name__ == "__main__":
+    main()
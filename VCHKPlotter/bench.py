@@ -0,0 +1,603 @@
+# MIT License
+
+# Copyright (c) 2022 Ben.Thornton955@cranfield.ac.uk (ben.thornton@astrazeneca.com)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Benchmarks for the parser and plotters, on synthetic .vchk files.
+
+Generates a .vchk file in the same format as `bcftools stats` at a chosen
+scale, then times:
+- importing the command-line script (startup),
+- `FileHandler.parse`,
+- `.plot()` and `.save()` of every `DataPlotter` subclass,
+- drawing the simple bar charts with `sns.barplot` and with
+  `DataPlotter.draw_bars`,
+- the whole program end-to-end (`main()`),
+- the whole program on a gzipped file with `--index`, run twice so the
+  second run reads its sections through the saved index. The run fails
+  if the two do not write the same sections.
+
+It also soaks the plotters: plots every section `--soak` times (20 by
+default) in one process and reports how much its memory grew, to catch
+figures that are never released. The soak has its own file, with enough
+samples that the per-sample sections are summarised, and draws every
+summary of them. The run fails if any plot fails, or if memory grew by
+more than `--max-soak-growth` MB (10 by default). The repository has no
+test suite, so this is its regression check for leaked figures.
+
+The results are written as JSON so they can be compared across versions.
+
+Typical usage example:
+
+    `python -m VCHKPlotter.bench --samples 1000 --output bench.json`
+"""
+
+import argparse
+import contextlib
+import filecmp
+import gc
+import gzip
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from importlib import metadata
+from types import SimpleNamespace
+
+from .file_handler import FileHandler
+from .plotting_structured import (FIGURE_POOL, PER_SAMPLE_SECTIONS,
+                                  DataPlotter, pyplot, seaborn)
+from .profiling import current_rss_mb
+from .sample_summary import DEFAULT_MAX_SAMPLES, SUMMARY_MODES
+
+# Every section the program knows how to plot.
+SECTIONS = ["sn", "tstv", "sis", "af", "qual", "idd", "st", "dp", "psc",
+            "psi", "hwe"]
+
+# Default number of soak runs, and most MB memory may grow by over them
+# after the warm-up. A figure leaked per plot grows it by over 20 MB a run.
+DEFAULT_SOAK_RUNS = 20
+DEFAULT_MAX_SOAK_GROWTH = 10.0
+
+# Samples in the soak file: more than `DEFAULT_MAX_SAMPLES`, so the
+# per-sample sections are summarised. See `bench_soak()`.
+SOAK_SAMPLES = 2 * DEFAULT_MAX_SAMPLES
+
+# Samples in the file of `bench_indexed_gzip()`: enough that its per-sample
+# sections are longer than one read of the decompressor.
+INDEXED_GZIP_SAMPLES = 5000
+
+# Samples on the page of each per-sample section the soak plots sample
+# by sample.
+SOAK_PAGE_SAMPLES = 10
+
+SUMMARY_KEYS = [
+    "number of samples:", "number of records:", "number of no-ALTs:",
+    "number of SNPs:", "number of MNPs:", "number of indels:",
+    "number of others:", "number of multiallelic sites:",
+    "number of multiallelic SNP sites:"
+]
+
+
+def generate_vchk(path, samples=3, dp_bins=150, qual_rows=200, af_bins=50,
+                  seed=0) -> None:
+    """Writes a synthetic .vchk file in the format of `bcftools stats`.
+
+    Args:
+        path:
+            Where to write the file.
+        samples:
+            The number of samples, i.e. rows in the PSC and PSI sections.
+        dp_bins:
+            The number of rows in the DP section. The last is the ">500" bin.
+        qual_rows:
+            The number of rows in the QUAL section.
+        af_bins:
+            The number of rows in the AF section.
+        seed:
+            Seed for the random numbers, so files are reproducible.
+    """
+
+    rng = random.Random(seed)
+    count = rng.randint
+
+    with open(path, "w", encoding="utf-8") as out:
+        write = out.write
+
+        write("# This file was produced by bcftools stats (synthetic).\n")
+        write("# Definition of sets:\n# ID\t[2]id\t[3]tab-separated file names\n")
+        write("ID\t0\tsynthetic.vcf.gz\n")
+
+        write("# SN, Summary numbers:\n# SN\t[2]id\t[3]key\t[4]value\n")
+        for position, key in enumerate(SUMMARY_KEYS):
+            write(f"SN\t0\t{key}\t{samples if position == 0 else count(10, 10 ** 6)}\n")
+
+        write("# TSTV, transitions/transversions:\n")
+        write("# TSTV\t[2]id\t[3]ts\t[4]tv\t[5]ts/tv\t[6]ts (1st ALT)\t"
+              "[7]tv (1st ALT)\t[8]ts/tv (1st ALT)\n")
+        write("TSTV\t0\t40000\t20000\t2.00\t39900\t19950\t2.00\n")
+
+        stats_columns = ("[4]number of SNPs\t[5]number of transitions\t"
+                         "[6]number of transversions\t[7]number of indels\t"
+                         "[8]repeat-consistent\t[9]repeat-inconsistent\t"
+                         "[10]not applicable\n")
+
+        write("# Sis, Singleton stats:\n")
+        write(f"# SiS\t[2]id\t[3]allele count\t{stats_columns}")
+        write("SiS\t0\t1\t100\t60\t40\t10\t0\t0\t10\n")
+
+        write("# AF, Stats by non-reference allele frequency:\n")
+        write(f"# AF\t[2]id\t[3]allele frequency\t{stats_columns}")
+        for row in range(af_bins):
+            write(f"AF\t0\t{row / af_bins:.6f}\t{count(0, 1000)}\t"
+                  f"{count(1, 600)}\t{count(1, 400)}\t{count(1, 100)}\t"
+                  f"0\t0\t{count(0, 100)}\n")
+
+        write("# QUAL, Stats by quality\n")
+        write("# QUAL\t[2]id\t[3]Quality\t[4]number of SNPs\t"
+              "[5]number of transitions (1st ALT)\t"
+              "[6]number of transversions (1st ALT)\t[7]number of indels\n")
+        for row in range(qual_rows):
+            write(f"QUAL\t0\t{row * 1.5:.1f}\t{count(0, 1000)}\t"
+                  f"{count(1, 600)}\t{count(1, 400)}\t{count(0, 100)}\n")
+
+        write("# IDD, InDel distribution:\n")
+        write("# IDD\t[2]id\t[3]length (deletions negative)\t[4]count\n")
+        for length in range(-20, 21):
+            if length:
+                write(f"IDD\t0\t{length}\t{count(1, 500)}\n")
+
+        write("# ST, Substitution types:\n# ST\t[2]id\t[3]type\t[4]count\n")
+        for source in "ACGT":
+            for target in "ACGT":
+                if source != target:
+                    write(f"ST\t0\t{source}>{target}\t{count(100, 1000)}\n")
+
+        write("# DP, Depth distribution\n")
+        write("# DP\t[2]id\t[3]bin\t[4]number of genotypes\t"
+              "[5]fraction of genotypes (%)\t[6]number of sites\t"
+              "[7]fraction of sites (%)\n")
+        for row in range(dp_bins):
+            depth_bin = row if row < dp_bins - 1 else ">500"
+            write(f"DP\t0\t{depth_bin}\t{count(0, 1000)}\t{rng.random():.6f}\t"
+                  f"{count(0, 100)}\t{rng.random():.6f}\n")
+
+        write("# PSC, Per-sample counts.\n")
+        write("# PSC\t[2]id\t[3]sample\t[4]nRefHom\t[5]nNonRefHom\t[6]nHets\t"
+              "[7]nTransitions\t[8]nTransversions\t[9]nIndels\t"
+              "[10]average depth\t[11]nSingletons\t[12]nHapRef\t"
+              "[13]nHapAlt\t[14]nMissing\n")
+        for sample in range(samples):
+            write(f"PSC\t0\tsample{sample}\t{count(0, 9999)}\t{count(0, 999)}\t"
+                  f"{count(0, 999)}\t{count(0, 999)}\t{count(0, 999)}\t"
+                  f"{count(0, 99)}\t{rng.random() * 30:.1f}\t{count(0, 99)}\t"
+                  f"0\t0\t{count(0, 99)}\n")
+
+        write("# PSI, Per-Sample Indels.\n")
+        write("# PSI\t[2]id\t[3]sample\t[4]in-frame\t[5]out-frame\t"
+              "[6]not applicable\t[7]out/(in+out) ratio\t[8]nHets\t[9]nAA\n")
+        for sample in range(samples):
+            write(f"PSI\t0\tsample{sample}\t0\t0\t{count(0, 99)}\t0.00\t"
+                  f"{count(0, 99)}\t{count(0, 99)}\n")
+
+        write("# HWE\n")
+        write("# HWE\t[2]id\t[3]1st ALT allele frequency\t"
+              "[4]Number of observations\t[5]25th percentile\t[6]median\t"
+              "[7]75th percentile\n")
+        for row in range(af_bins):
+            write(f"HWE\t0\t{row / af_bins:.6f}\t{count(0, 100)}\t"
+                  f"{rng.random() * 0.3:.6f}\t{rng.random() * 0.5:.6f}\t"
+                  f"{rng.random() * 0.7:.6f}\n")
+
+
+def time_call(function, repeat):
+    """Times a function over `repeat` runs.
+
+    Returns:
+        A dict of the fastest and median wall time, in seconds, or the
+        error message if the function raised.
+    """
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            function()
+        except Exception as exception:
+            return {"error": f"{type(exception).__name__}: {exception}"}
+        timings.append(time.perf_counter() - start)
+
+    return {"min": min(timings), "median": statistics.median(timings)}
+
+
+def bench_startup(repeat) -> dict:
+    """Times a fresh interpreter importing the command-line script."""
+
+    command = [sys.executable, "-c", "import VCHKPlotter.__main__"]
+
+    return time_call(
+        lambda: subprocess.run(command, check=True, capture_output=True),
+        repeat)
+
+
+def bench_parse(path, repeat) -> dict:
+    """Times `FileHandler.parse` of every section in `path`."""
+
+    args = SimpleNamespace(in_dir=path, out_dir=None, verbose=False)
+
+    return time_call(lambda: FileHandler(args, list(SECTIONS)).parse(),
+                     repeat)
+
+
+def bench_plotters(path, out_dir, repeat) -> dict:
+    """Times `.plot()` and `.save()` of the plotter for every section."""
+
+    args = SimpleNamespace(in_dir=path, out_dir=out_dir, verbose=False)
+    sections = FileHandler(args, list(SECTIONS)).parse()
+
+    results = {}
+    for name in SECTIONS:
+        os.makedirs(os.path.join(out_dir, name), exist_ok=True)
+        data = sections.get_section(name)._data_frame
+
+        plotters = []
+
+        def plot():
+            # Plotters may change their data, so each gets its own copy.
+            plotter = DataPlotter.get_plotter(name, data.copy(), out_dir)
+            plotters.append(plotter.plot())
+
+        def save():
+            plotters.pop().save()
+
+        plot_timings = []
+        save_timings = []
+        for _ in range(repeat):
+            plot_result = time_call(plot, 1)
+            if "error" in plot_result:
+                plot_timings = plot_result
+                break
+            plot_timings.append(plot_result["min"])
+
+            save_result = time_call(save, 1)
+            if "error" in save_result:
+                save_timings = save_result
+                break
+            save_timings.append(save_result["min"])
+
+            pyplot().close("all")
+
+        results[type(DataPlotter.get_plotter(name, data, out_dir)).__name__] = {
+            "plot": summarise(plot_timings),
+            "save": summarise(save_timings),
+        }
+
+    pyplot().close("all")
+
+    return results
+
+
+def bench_bars(repeat) -> dict:
+    """Times drawing a bar chart of values that are already known with
+    `sns.barplot` and with `DataPlotter.draw_bars`, with as many bars as
+    the TSTV, SN and SiS plots have."""
+
+    sns = seaborn()
+    plotter = DataPlotter.get_plotter("tstv", None, None)
+
+    results = {}
+    for name, n_bars in (("tstv", 2), ("sn", 7), ("sis", 10)):
+        labels = [f"bar {i}" for i in range(n_bars)]
+        heights = list(range(1, n_bars + 1))
+
+        def draw(with_seaborn):
+            figure, axis = FIGURE_POOL.take()
+            if with_seaborn:
+                sns.barplot(ax=axis, x=labels, y=heights, palette="flare")
+            else:
+                plotter.draw_bars(axis, labels, heights)
+            FIGURE_POOL.give_back(figure)
+
+        results[name] = {
+            "seaborn": time_call(lambda: draw(True), repeat),
+            "direct": time_call(lambda: draw(False), repeat),
+        }
+
+        timings = results[name]
+        if "min" in timings["seaborn"] and "min" in timings["direct"]:
+            timings["speedup"] = timings["seaborn"]["min"] / \
+                timings["direct"]["min"]
+
+    return results
+
+
+def soak_cases(sections) -> list:
+    """The plots `bench_soak()` draws on every run: each section, and for
+    the per-sample sections, each summary (see `SUMMARY_MODES`) and a page
+    plotted sample by sample.
+
+    Args:
+        sections:
+            The parsed `StatsFileObject` of the soak file.
+
+    Returns:
+        A (label, section name, data, plotter options) tuple per plot.
+    """
+
+    cases = []
+    for name in SECTIONS:
+        section = sections.get_section(name)
+
+        if name not in PER_SAMPLE_SECTIONS:
+            cases.append((name, name, section._data_frame, {}))
+            continue
+
+        for mode in SUMMARY_MODES:
+            cases.append((f"{name}:{mode}", name, section._data_frame,
+                          {"sample_summary": mode}))
+
+        page = section.get_pages(SOAK_PAGE_SAMPLES)[0]
+        cases.append((f"{name}:page", name, page._data_frame,
+                      {"page": page.get_page()}))
+
+    return cases
+
+
+def bench_soak(path, out_dir, runs) -> dict:
+    """Plots and saves every section `runs` times in this process and
+    reports how its resident memory changed. See `soak_cases()`.
+
+    Plots are saved as small PNGs so thousands of runs finish quickly; the
+    figures are the same size whatever they are saved as. A plot that
+    fails is recorded and left out of the rest of the runs; the soak has
+    failed if any did.
+
+    Returns:
+        The resident memory after the first tenth of the runs, and at least
+        two (by which time every figure and cache has been allocated once),
+        and after the last one,
+        in MB, their difference, the plots that were drawn and those that
+        failed.
+    """
+
+    args = SimpleNamespace(in_dir=path, out_dir=out_dir, verbose=False)
+    sections = FileHandler(args, list(SECTIONS)).parse()
+    options = {"file_format": "png", "dpi_quality": 20}
+
+    for name in SECTIONS:
+        os.makedirs(os.path.join(out_dir, name), exist_ok=True)
+
+    cases = soak_cases(sections)
+    errors = {}
+
+    warm_up = min(runs, max(2, runs // 10))
+    samples = []
+    for run in range(runs):
+        for case in list(cases):
+            label, name, data, case_options = case
+            try:
+                DataPlotter.get_plotter(name, data.copy(), out_dir,
+                                        **options, **case_options) \
+                    .plot().save()
+            except Exception as exception:
+                cases.remove(case)
+                errors[label] = \
+                    f"run {run}: {type(exception).__name__}: {exception}"
+
+        if run + 1 == warm_up or run + 1 == runs:
+            gc.collect()
+            samples.append(current_rss_mb())
+
+    return {
+        "runs": runs,
+        "samples": sections.get_section("psc")._data_frame.shape[0],
+        "plots": [label for label, _, _, _ in cases],
+        "errors": errors,
+        "rss_mb_warm": samples[0],
+        "rss_mb_end": samples[-1],
+        "growth_mb": samples[-1] - samples[0],
+    }
+
+
+def summarise(timings):
+    """Turns a list of timings into a dict of the fastest and median."""
+
+    if isinstance(timings, dict) or not timings:
+        return timings or {"error": "not run"}
+
+    return {"min": min(timings), "median": statistics.median(timings)}
+
+
+def run_main(path, out_dir, flags) -> None:
+    """Runs the whole program, `main()`, with the given flags."""
+
+    from .__main__ import main
+
+    argv = sys.argv
+    sys.argv = ["VCHKPlotter", path, out_dir] + flags
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            main()
+    finally:
+        sys.argv = argv
+        pyplot().close("all")
+
+
+def bench_end_to_end(path, out_dir, flags, repeat) -> dict:
+    """Times the whole program, `main()`, with the given flags."""
+
+    return time_call(lambda: run_main(path, out_dir, flags), repeat)
+
+
+def bench_indexed_gzip(out_dir, seed=0) -> dict:
+    """Times the whole program on a gzipped .vchk file of
+    `INDEXED_GZIP_SAMPLES` samples with `--index`, once to build the index
+    and once more to read through it, and checks both runs wrote the same
+    text for every section.
+
+    Returns:
+        The seconds each run took, and whether their output "matches".
+    """
+
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, "indexed.vchk")
+    gzipped = path + ".gz"
+
+    generate_vchk(path, samples=INDEXED_GZIP_SAMPLES, seed=seed)
+    with open(path, "rb") as plain, gzip.open(gzipped, "wb") as packed:
+        shutil.copyfileobj(plain, packed)
+
+    flags = ["-a", "--index", "--format", "png", "--dpi", "20"]
+
+    results = {}
+    for run in ("cold", "warm"):
+        results[run] = time_call(
+            lambda: run_main(gzipped, os.path.join(out_dir, run), flags), 1)
+
+    names = [f"{name}/{name}.txt" for name in SECTIONS]
+    matches, _, _ = filecmp.cmpfiles(os.path.join(out_dir, "cold"),
+                                     os.path.join(out_dir, "warm"),
+                                     names, shallow=False)
+    results["matches"] = len(matches) == len(names)
+
+    return results
+
+
+def package_version() -> str:
+    """The installed version of this package, if it is installed."""
+
+    try:
+        return metadata.version("VCHKPlotter")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def main() -> None:
+    """Parses command line arguments, runs the benchmarks and writes
+    the results as JSON."""
+
+    parser = argparse.ArgumentParser(
+        description="Benchmarks VCHKPlotter on a synthetic .vchk file.")
+    parser.add_argument("--samples", type=int, default=3,
+                        help="number of samples in the PSC and PSI sections")
+    parser.add_argument("--dp-bins", type=int, default=150,
+                        help="number of rows in the DP section")
+    parser.add_argument("--qual-rows", type=int, default=200,
+                        help="number of rows in the QUAL section")
+    parser.add_argument("--af-bins", type=int, default=50,
+                        help="number of rows in the AF and HWE sections")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of times to run each benchmark")
+    parser.add_argument("--flags", default="-a",
+                        help="flags for the end-to-end run, e.g. '-sn -tstv'")
+    parser.add_argument("--output", "-o",
+                        help="file to write the JSON results to. Default: stdout")
+    parser.add_argument("--keep", action="store_true",
+                        help="keep the generated .vchk file and plots")
+    parser.add_argument("--soak", type=int, default=DEFAULT_SOAK_RUNS,
+                        help="plot every section this many times in one "
+                             "process and report how much memory grew. "
+                             "0 to skip")
+    parser.add_argument("--max-soak-growth", type=float,
+                        default=DEFAULT_MAX_SOAK_GROWTH,
+                        help="fail if memory grew by more than this many MB "
+                             "during --soak")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="vchk-bench-")
+    path = os.path.join(work_dir, "synthetic.vchk")
+    scale = {
+        "samples": args.samples,
+        "dp_bins": args.dp_bins,
+        "qual_rows": args.qual_rows,
+        "af_bins": args.af_bins,
+        "seed": args.seed,
+    }
+
+    try:
+        generate_vchk(path, **scale)
+
+        results = {
+            "version": package_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": dict(scale, file_bytes=os.path.getsize(path)),
+            "repeat": args.repeat,
+            "startup": bench_startup(args.repeat),
+            "parse": bench_parse(path, args.repeat),
+            "plotters": bench_plotters(
+                path, os.path.join(work_dir, "plotters"), args.repeat),
+            "bars": bench_bars(args.repeat),
+            "end_to_end": bench_end_to_end(
+                path, os.path.join(work_dir, "end_to_end"),
+                args.flags.split(), args.repeat),
+            "indexed_gzip": bench_indexed_gzip(
+                os.path.join(work_dir, "indexed_gzip"), args.seed),
+        }
+
+        if args.soak > 0:
+            soak_path = os.path.join(work_dir, "soak.vchk")
+            generate_vchk(soak_path, **dict(
+                scale, samples=max(args.samples, SOAK_SAMPLES)))
+
+            results["soak"] = bench_soak(
+                soak_path, os.path.join(work_dir, "soak"), args.soak)
+
+    finally:
+        if args.keep:
+            print(f"Kept benchmark files in {work_dir}", file=sys.stderr)
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+
+    if not results["indexed_gzip"]["matches"]:
+        print("A second --index run of a gzipped file did not write the "
+              "same sections as the first", file=sys.stderr)
+        sys.exit(1)
+
+    if args.soak > 0 and results["soak"]["errors"]:
+        for label, problem in results["soak"]["errors"].items():
+            print(f"Soak plot {label} failed ({problem})", file=sys.stderr)
+        sys.exit(1)
+
+    if args.soak > 0 and results["soak"]["growth_mb"] > args.max_soak_growth:
+        print(f"Memory grew by {results['soak']['growth_mb']:.1f} MB over "
+              f"{args.soak} runs (limit {args.max_soak_growth} MB)",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+# Entry point to program
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,541 @@
+# MIT License
+
+# Copyright (c) 2022 Ben.Thornton955@cranfield.ac.uk (ben.thornton@astrazeneca.com)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Reading of gzip, BGZF and zstd compressed .vchk files.
+
+The compression of an input is detected from its first bytes, not its
+name, and the input is decompressed as it is read. Offsets used by the
+rest of the package (e.g. in a `SectionIndex`) are always offsets into the
+decompressed text.
+
+BGZF (`bgzip`) files are made of small, independent blocks, so they are
+decompressed on several threads and can be seeked through with virtual
+offsets. Plain gzip and zstd files can only be read from the start.
+
+Typical usage example:
+
+    with open_input(in_file, threads=4) as stats_file:
+        index = SectionIndex.scan(stats_file)
+"""
+
+import bisect
+import gzip
+import os
+import zlib
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+# First bytes of each supported format.
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Size of the fixed part of a gzip member header and of the BGZF extra
+# field subfield ("BC", length 2) that holds the block size.
+GZIP_HEADER_SIZE = 12
+BGZF_SUBFIELD = b"BC\x02\x00"
+
+# Usual file name suffixes of compressed input. Only used for naming
+# output, never to detect the compression.
+COMPRESSED_SUFFIXES = (".gz", ".bgz", ".zst")
+
+# How many bytes to read from a sequential stream at a time.
+READ_SIZE = 1 << 20
+
+# Default number of threads to decompress with.
+DEFAULT_THREADS = min(4, os.cpu_count() or 1)
+
+
+def detect_compression(path) -> Optional[str]:
+    """Detects how a file is compressed from its first bytes.
+
+      Args:
+          path:
+              Location of the file.
+
+      Returns:
+          "bgzf", "gzip" or "zstd", or `None` if the file is not compressed.
+
+      Raises:
+          FileNotFoundError:
+              If there is no such file. Handled by the caller.
+      """
+
+    with open(path, "rb") as stream:
+        header = stream.read(GZIP_HEADER_SIZE + len(BGZF_SUBFIELD))
+
+    return compression_of(header)
+
+
+def compression_of(header) -> Optional[str]:
+    """Detects how a stream is compressed from its first (up to 16) bytes.
+      See `detect_compression`."""
+
+    if header.startswith(ZSTD_MAGIC):
+        return "zstd"
+
+    if header.startswith(GZIP_MAGIC):
+        # BGZF blocks are gzip members with a "BC" extra subfield first.
+        has_extra = len(header) > 3 and header[3] & 4
+        if has_extra and header[GZIP_HEADER_SIZE:] == BGZF_SUBFIELD:
+            return "bgzf"
+        return "gzip"
+
+    return None
+
+
+def open_input(path, threads=DEFAULT_THREADS):
+    """Opens a .vchk file for reading in binary mode, decompressing it
+      if need be.
+
+      Args:
+          path:
+              Location of the file.
+          threads:
+              How many threads to decompress with, where the format
+              allows it.
+
+      Returns:
+          The file itself if it is not compressed, a `BgzfReader` for BGZF
+          input and a `SequentialReader` for gzip or zstd input.
+
+      Raises:
+          FileNotFoundError:
+              If there is no such file. Handled by the caller.
+          ImportError:
+              If the package needed to decompress the file is not
+              installed. Handled by the caller.
+      """
+
+    compression = detect_compression(path)
+
+    if compression == "bgzf":
+        return BgzfReader(path, threads)
+    if compression == "gzip":
+        return SequentialReader(lambda: open_gzip(path, threads))
+    if compression == "zstd":
+        return SequentialReader(lambda: open_zstd(path))
+
+    return open(path, "rb")
+
+
+def open_pipe(stream, threads=DEFAULT_THREADS):
+    """Wraps a stream that can only be read once (e.g. standard input),
+      decompressing it if need be.
+
+      BGZF is read like any other gzip stream, as blocks cannot be
+      seeked to in a pipe.
+
+      Args:
+          stream:
+              The stream, a binary `io.BufferedReader`.
+          threads:
+              How many threads to decompress with, where the format
+              allows it.
+
+      Returns:
+          The compression ("bgzf", "gzip", "zstd" or `None`) and a
+          `SequentialReader` over the (decompressed) stream.
+      """
+
+    compression = compression_of(
+        stream.peek(GZIP_HEADER_SIZE + len(BGZF_SUBFIELD)))
+
+    opened = []
+
+    def opener():
+        if opened:
+            raise OSError("Cannot go back in a stream that is not a file")
+        opened.append(stream)
+
+        if compression in ("bgzf", "gzip"):
+            return open_gzip(stream, threads)
+        if compression == "zstd":
+            return open_zstd(stream)
+        return stream
+
+    return compression, SequentialReader(opener)
+
+
+def open_gzip(path, threads):
+    """Opens a gzip stream from a path or binary file object. Uses
+      python-isal's threaded reader, which decompresses on a separate
+      thread, if it is installed."""
+
+    if threads > 1:
+        try:
+            from isal import igzip_threaded
+            return igzip_threaded.open(path, "rb", threads=threads)
+        except ImportError:
+            pass
+
+    return gzip.open(path, "rb")
+
+
+def open_zstd(path):
+    """Opens a zstd stream from a path or binary file object, with the
+      zstandard package or, failing that, the standard library's
+      `compression.zstd` (Python 3.14+).
+
+      Raises:
+          ImportError:
+              If neither is available. Handled by the caller.
+      """
+
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+
+    if zstandard is not None:
+        source = path if hasattr(path, "read") else open(path, "rb")
+        return zstandard.ZstdDecompressor().stream_reader(
+            source, read_across_frames=True)
+
+    try:
+        from compression import zstd
+    except ImportError:
+        raise ImportError(
+            "Reading zstd compressed input needs the zstandard package") from None
+
+    return zstd.open(path, "rb")
+
+
+def decompress_block(block) -> bytes:
+    """Decompresses a single BGZF block (a whole gzip member).
+
+      Raises:
+          OSError:
+              If the block is corrupt. Handled by the caller.
+      """
+
+    try:
+        return zlib.decompress(block, 31)
+    except zlib.error as exception:
+        raise OSError(f"Corrupt BGZF block: {exception}") from None
+
+
+class SequentialReader:
+    """A binary stream that can only be decompressed from the start.
+
+      Seeking forward reads (and drops) the bytes in between. Seeking
+      backward reopens the stream. Can also keep the bytes it reads, so
+      the caller can go back to them without reading the stream twice.
+
+      Attributes:
+          _opener: Function that opens the underlying stream.
+          _stream: The underlying (decompressing) stream.
+          _position: The offset of the next byte to read.
+          _kept: The bytes kept since `_kept_from`, or `None` if bytes are
+              not being kept.
+          _kept_from: The offset of the first byte in `_kept`.
+      """
+
+    def __init__(self, opener) -> None:
+        """Initialises a reader at the start of the stream `opener` opens."""
+
+        self._opener = opener
+        self._stream = opener()
+        self._position = 0
+        self._kept = None
+        self._kept_from = 0
+
+    def read(self, size=-1) -> bytes:
+        """Reads `size` bytes, fewer only at the end of the stream, or to
+          the end of the stream if `size` is negative."""
+
+        if size < 0:
+            return b"".join(iter(lambda: self.read1(READ_SIZE), b""))
+
+        parts = []
+        remaining = size
+        while remaining > 0:
+            data = self.read1(remaining)
+            if not data:
+                break
+            parts.append(data)
+            remaining -= len(data)
+
+        return b"".join(parts)
+
+    def read1(self, size=READ_SIZE) -> bytes:
+        """Reads up to `size` bytes: whatever has arrived so far rather
+          than wait for all of them, so a pipe can be scanned as it is
+          written to. Only returns no bytes at the end of the stream."""
+
+        read = getattr(self._stream, "read1", self._stream.read)
+        data = read(size)
+        self._position += len(data)
+        if self._kept is not None:
+            self._kept += data
+
+        return data
+
+    def seek(self, offset, whence=os.SEEK_SET) -> int:
+        """Moves to `offset` bytes from the start of the stream."""
+
+        if whence != os.SEEK_SET:
+            raise OSError("Can only seek from the start of a compressed stream")
+
+        if offset < self._position:
+            self._stream.close()
+            self._stream = self._opener()
+            self._position = 0
+            self._kept = None
+
+        while self._position < offset:
+            if not self.read1(min(offset - self._position, READ_SIZE)):
+                break
+
+        return self._position
+
+    def tell(self) -> int:
+        """Returns the offset of the next byte to read."""
+        return self._position
+
+    def keep(self) -> None:
+        """Starts keeping every byte read from here on. See `.kept()`."""
+
+        self._kept = bytearray()
+        self._kept_from = self._position
+
+    def kept(self, start, end) -> bytes:
+        """Returns the kept bytes from offset `start` up to `end`."""
+
+        return bytes(self._kept[start - self._kept_from:end - self._kept_from])
+
+    def release(self, offset) -> None:
+        """Stops keeping the bytes before `offset`."""
+
+        del self._kept[:offset - self._kept_from]
+        self._kept_from = offset
+
+    def close(self) -> None:
+        self._stream.close()
+
+    def __enter__(self) -> "SequentialReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class BgzfReader:
+    """A binary stream over the decompressed text of a BGZF file.
+
+      Blocks are read from the file a batch at a time and the batch is
+      decompressed on a pool of threads (zlib releases the GIL). Every
+      block read is remembered, so `.seek()` can go straight to the block
+      a decompressed offset is in.
+
+      A virtual offset is the file offset of a block shifted left by 16
+      bits, plus an offset into the block's decompressed bytes, as in
+      htslib. It lets a later run seek to a section without first reading
+      the blocks before it.
+
+      Attributes:
+          _raw: The BGZF file itself.
+          _threads: How many threads to decompress with.
+          _pool: The thread pool, if `_threads` is more than one.
+          _block_starts: The file offset of every block seen, in order.
+          _block_offsets: The decompressed offset each of those blocks
+              starts at.
+          _next_block: The file offset of the next block to read.
+          _buffer: The decompressed bytes of the last batch of blocks.
+          _buffer_start: The decompressed offset `_buffer` starts at.
+          _buffer_position: The position of the next byte to read within
+              `_buffer`.
+      """
+
+    def __init__(self, path, threads=DEFAULT_THREADS) -> None:
+        """Initialises a reader at the start of the BGZF file at `path`."""
+
+        self._raw = open(path, "rb")
+        self._threads = max(1, threads)
+        self._pool = ThreadPoolExecutor(self._threads) \
+            if self._threads > 1 else None
+
+        self._block_starts = [0]
+        self._block_offsets = [0]
+        self._next_block = 0
+
+        self._buffer = b""
+        self._buffer_start = 0
+        self._buffer_position = 0
+
+    def _remember_block(self, start, offset) -> None:
+        """Adds a block to the table used by `.seek()`."""
+
+        position = bisect.bisect_left(self._block_starts, start)
+        if position == len(self._block_starts) \
+                or self._block_starts[position] != start:
+            self._block_starts.insert(position, start)
+            self._block_offsets.insert(position, offset)
+
+    def _read_block(self) -> Optional[bytes]:
+        """Reads the next (compressed) block from the file.
+
+          Returns:
+              The whole block, or `None` at the end of the file.
+
+          Raises:
+              OSError:
+                  If the block is not a BGZF block. Handled by the caller.
+          """
+
+        header = self._raw.read(GZIP_HEADER_SIZE)
+        if not header:
+            return None
+        if not header.startswith(GZIP_MAGIC) or len(header) < GZIP_HEADER_SIZE:
+            raise OSError("File not in the correct format. Not a BGZF block")
+
+        extra = self._raw.read(int.from_bytes(header[10:12], "little"))
+
+        # Find the "BC" subfield, which holds the block size less one.
+        position, block_size = 0, None
+        while position + 4 <= len(extra):
+            length = int.from_bytes(extra[position + 2:position + 4], "little")
+            if extra[position:position + 2] == b"BC" and length == 2:
+                block_size = int.from_bytes(
+                    extra[position + 4:position + 6], "little") + 1
+            position += 4 + length
+
+        if block_size is None:
+            raise OSError("File not in the correct format. Not a BGZF block")
+
+        rest = self._raw.read(block_size - len(header) - len(extra))
+
+        return header + extra + rest
+
+    def _fill(self) -> bool:
+        """Replaces the buffer with the next batch of blocks.
+
+          Returns:
+              `False` at the end of the file.
+          """
+
+        start = self._buffer_start + len(self._buffer)
+
+        self._raw.seek(self._next_block)
+        blocks = []
+        for _ in range(self._threads * 4):
+            block = self._read_block()
+            if block is None:
+                break
+
+            # The last 4 bytes of a gzip member are its decompressed size,
+            # so the next block's offset is known before decompressing.
+            self._remember_block(self._next_block, start)
+            self._next_block += len(block)
+            start += int.from_bytes(block[-4:], "little")
+            blocks.append(block)
+
+        if not blocks:
+            return False
+
+        parts = self._pool.map(decompress_block, blocks) \
+            if self._pool is not None else map(decompress_block, blocks)
+
+        self._buffer_start += len(self._buffer)
+        self._buffer = b"".join(parts)
+        self._buffer_position = 0
+
+        return True
+
+    def read(self, size=-1) -> bytes:
+        """Reads up to `size` bytes, or to the end of the file if `size`
+          is negative."""
+
+        parts = []
+        remaining = size
+        while remaining != 0:
+            if self._buffer_position >= len(self._buffer) and not self._fill():
+                break
+
+            end = len(self._buffer) if remaining < 0 \
+                else min(len(self._buffer), self._buffer_position + remaining)
+            parts.append(self._buffer[self._buffer_position:end])
+            if remaining > 0:
+                remaining -= end - self._buffer_position
+            self._buffer_position = end
+
+        return b"".join(parts)
+
+    def seek(self, offset, whence=os.SEEK_SET) -> int:
+        """Moves to decompressed `offset`, starting from the closest
+          block before it that has been seen."""
+
+        if whence != os.SEEK_SET:
+            raise OSError("Can only seek from the start of a compressed stream")
+
+        if not self._buffer_start <= offset <= self._buffer_start + len(self._buffer):
+            position = bisect.bisect_right(self._block_offsets, offset) - 1
+            self._next_block = self._block_starts[position]
+            self._buffer = b""
+            self._buffer_start = self._block_offsets[position]
+
+        self._buffer_position = offset - self._buffer_start
+        while self._buffer_position > len(self._buffer):
+            skipped = self._buffer_position - len(self._buffer)
+            if not self._fill():
+                break
+            self._buffer_position = skipped
+
+        return self.tell()
+
+    def seek_virtual(self, virtual_offset, offset) -> int:
+        """Moves to a virtual offset.
+
+          Args:
+              virtual_offset:
+                  The virtual offset, e.g. from `.virtual_offset()`.
+              offset:
+                  The decompressed offset the virtual offset points to.
+          """
+
+        self._remember_block(virtual_offset >> 16,
+                             offset - (virtual_offset & 0xFFFF))
+
+        return self.seek(offset)
+
+    def virtual_offset(self, offset) -> int:
+        """Returns the virtual offset of a decompressed offset. The block
+          `offset` is in must have been read already."""
+
+        position = bisect.bisect_right(self._block_offsets, offset) - 1
+
+        return (self._block_starts[position] << 16) \
+            | (offset - self._block_offsets[position])
+
+    def tell(self) -> int:
+        """Returns the decompressed offset of the next byte to read."""
+        return self._buffer_start + self._buffer_position
+
+    def close(self) -> None:
+        self._raw.close()
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    def __enter__(self) -> "BgzfReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
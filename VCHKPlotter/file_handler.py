@@ -36,15 +36,30 @@ Typical usage example:
 """
 
 import ast
+import io
+import mmap
+import os
 import re
+import stat
 import sys
 
-from typing import List
+from typing import Dict, Iterator, List, Tuple
 
+import numpy as np
 import pandas as pd
 
-from .plotting_structured import DataPlotter
-from .utils import error, write_as_text
+from .compressed_input import (DEFAULT_THREADS, BgzfReader, SequentialReader,
+                               detect_compression, open_input, open_pipe)
+from .plotting_structured import DataPlotter, page_file_name
+from .profiling import phase
+from .section_cache import SectionCache
+from .section_index import SIDECAR_SUFFIX, SectionIndex, scan_sections
+from .utils import (copy_byte_range, error, info, warn, write_as_bytes,
+                    write_as_text, write_page_index)
+
+# Version of the parser's output. Bump this whenever a change to the parser
+# changes the parsed DataFrames, so cached sections are not reused.
+PARSER_VERSION = 1
 
 
 class StatsFileObject:
@@ -61,6 +76,7 @@ class StatsFileObject:
             """
 
         self._sections = dict(**kwargs)
+        self._index = None
 
     def add_section(self, name, section) -> None:
         """Register a section (DataFrame) in this instance's 
@@ -80,11 +96,33 @@ class StatsFileObject:
 
         return self._sections[name]
 
+    def set_index(self, index) -> None:
+        """Register the `SectionIndex` of the file these sections
+            were parsed from."""
+
+        self._index = index
+
+    def available_sections(self) -> List[str]:
+        """Lists every section present in the .vchk file, parsed or not.
+
+            Returns:
+                The (lower case) section names, in file order. Only the
+                parsed sections if no index has been registered, and only
+                those up to the last wanted one if the file was not read
+                to the end. See `FileHandler.scan_and_parse()`.
+            """
+
+        if self._index is None:
+            return list(self._sections)
+
+        return self._index.names()
+
 
 class FileHandler:
     """Parses a .vchk file into its appropriate sections.
 
-      Reads a .vchk file and parses a statistics section whenever it sees a section header.
+      Scans a .vchk file for its section headers and then parses only the
+      statistics sections that have been asked for, seeking straight to each one.
       The class `Section` is responsible for iterating over the relevant lines in the file
       and interpreting these lines as a Pandas' Dataframe.
       Each `Section` instance is then stored within a `StatsFileObject` instance to allow
@@ -97,6 +135,23 @@ class FileHandler:
               Internal class use only.
           _actions: The list of user-provided flags. Only parse these sections.
               Internal class use only.
+          _index: The `SectionIndex` of the input file, once it has been scanned.
+              Internal class use only.
+          _use_sidecar: Whether to reuse (or write) a `<in_file>.idx` sidecar index.
+              Internal class use only.
+          _cache: The `SectionCache` of parsed sections, if one is in use.
+              Internal class use only.
+          _use_mmap: Whether to parse sections straight from a memory map of
+              the input. Internal class use only.
+          _mapped: The memory map of the input while it is being parsed.
+              Internal class use only.
+          _threads: How many threads to decompress compressed input with.
+              Internal class use only.
+          _compression: How the input is compressed ("bgzf", "gzip" or
+              "zstd"), or `None`. Internal class use only.
+          _retained: The raw bytes of the wanted sections of a gzip or zstd
+              input, kept while scanning it, by section start offset.
+              Internal class use only.
       """
 
     # Regular expression pattern for a section header.
@@ -121,6 +176,23 @@ class FileHandler:
         self._in_file = clargs.in_dir
         self._out_file = clargs.out_dir
         self._actions = actions
+        self._index = None
+        self._use_sidecar = getattr(clargs, "index", False)
+        self._verbose = getattr(clargs, "verbose", False)
+        self._use_mmap = getattr(clargs, "mmap", False)
+        self._mapped = None
+        self._threads = getattr(clargs, "threads", DEFAULT_THREADS)
+        self._compression = None
+        self._retained = {}
+
+        self._cache = None
+        cache_dir = getattr(clargs, "cache_dir", None)
+        if cache_dir is not None:
+            try:
+                self._cache = SectionCache(cache_dir, clargs.cache_size << 20)
+            except OSError:
+                warn(self._verbose,
+                     f"Could not create cache folder {cache_dir}. Continuing without it.")
 
     def parse(self) -> StatsFileObject:
         """Parses a .vchk file.
@@ -133,48 +205,567 @@ class FileHandler:
                 been parsed. 
             """
 
+        stats_file_object = StatsFileObject()
+
+        for data_type_title, section in self.iter_sections():
+            stats_file_object.add_section(data_type_title, section)
+
+        stats_file_object.set_index(self._index)
+
+        return stats_file_object
+
+    def iter_sections(self) -> Iterator[Tuple[str, "Section"]]:
+        """Parses the wanted sections of the .vchk file, yielding each one
+            as soon as it has been parsed.
+
+            Sections are parsed while the file is being scanned, as soon as
+            the "#" line that ends each one has been read, so the caller
+            can start on a section (e.g. plot it) while the rest of the file
+            is read. With `--index` or `--cache-dir` the whole file is
+            indexed first instead, as the sidecar and cache need it.
+
+            Tries opening the file and exits with an error message if file
+            cannot be found. The index is available from `.get_index()`
+            once every section has been yielded.
+
+            Yields:
+                The (lower case) name of each section and the parsed
+                `Section`, in file order.
+            """
+
+        if self.reads_stream():
+            yield from self.stream_sections()
+            return
+
+        try:
+            stats_file = self.open_input()
+        except FileNotFoundError:
+            error("No such file")
+            sys.exit(1)
+
+        with stats_file, phase("parse_file", path=self._in_file,
+                               bytes=os.path.getsize(self._in_file),
+                               compression=self._compression or "none"):
+
+            if not self._use_sidecar and self._cache is None:
+                yield from self.scan_and_parse(stats_file)
+                return
+
+            # Find where every section is first, so unwanted sections
+            # are never split into lines, let alone fields.
+            self._index = self.build_index(stats_file)
+            self.start_mapping(stats_file)
+
+            try:
+                for span in self._index:
+                    section = self.parse_wanted(stats_file, span)
+                    if section is not None:
+                        yield span.name, section
+            finally:
+                self.stop_mapping()
+                self._retained.clear()
+
+    def scan_and_parse(self, stats_file, parse=True) -> Iterator[Tuple[str, object]]:
+        """Scans the .vchk file, yielding each wanted section as soon as
+            its end has been read. Builds the index as it goes.
+
+            Stops reading as soon as every wanted section has been read
+            (see `.outstanding_sections()`), so e.g. `-sn -tstv` only reads
+            the first few hundred lines of even a huge file. The index then
+            only covers the sections up to there.
+
+            A gzip or zstd stream (or a pipe) is only read once: the bytes
+            of each wanted section are kept as the scan reads past them.
+            Otherwise sections are read through a second handle on the
+            file, so the scan is not disturbed.
+
+            Args:
+                stats_file:
+                    The .vchk file, opened by `.open_input()`, positioned
+                    at its start.
+                parse:
+                    Whether to parse the sections. If not, their raw bytes
+                    are yielded instead, header line included.
+
+            Yields:
+                The (lower case) name of the section and the parsed
+                `Section` (or its bytes), in file order.
+            """
+
+        sequential = isinstance(stats_file, SequentialReader)
+        if sequential:
+            stats_file.keep()
+            section_file = None
+        else:
+            section_file = self.open_input()
+            self.start_mapping(section_file)
+
+        spans = []
+        outstanding = self.outstanding_sections()
+        try:
+            for span in scan_sections(stats_file):
+                if isinstance(stats_file, BgzfReader):
+                    span.virtual_start = stats_file.virtual_offset(span.start)
+                spans.append(span)
+
+                if sequential:
+                    if self.wants_section(span.name):
+                        self._retained[span.start] = stats_file.kept(span.start,
+                                                                     span.end)
+                    stats_file.release(span.end)
+
+                if not self.wants_section(span.name):
+                    continue
+
+                outstanding.discard(span.name)
+
+                if not parse:
+                    yield span.name, self.read_span(section_file, span)
+                else:
+                    section = self.parse_wanted(section_file, span)
+                    if section is not None:
+                        yield span.name, section
+
+                if not outstanding:
+                    break
+
+        finally:
+            self.stop_mapping()
+            self._retained.clear()
+            if section_file is not None:
+                section_file.close()
+
+        self._index = SectionIndex(spans)
+
+    def parse_wanted(self, stats_file, span):
+        """Loads a section if it has been asked for.
+
+            Args:
+                stats_file:
+                    The .vchk file, opened by `.open_input()`.
+                span:
+                    The `SectionSpan` of the section.
+
+            Returns:
+                The parsed `Section`, or `None` if the section is not
+                wanted or could not be parsed.
+            """
+
+        # Only go to the trouble of parsing the section if
+        # the user has requested to view the stats of this
+        # section.
+        data_type_title = span.name
+        if not self.wants_section(data_type_title):
+            return None
+
+        try:
+            return self.load_section(stats_file, span)
+        except IOError:
+            self._actions.remove(data_type_title)
+            error(f"Could not parse section {data_type_title} properly")
+            return None
+
+    def start_mapping(self, stats_file) -> None:
+        """Memory-maps the .vchk file, if `--mmap` was given. See
+            `.map_file()`."""
+
+        if self._use_mmap and self._compression is None:
+            self._mapped = self.map_file(stats_file)
+        elif self._use_mmap:
+            warn(self._verbose,
+                 "Cannot memory-map compressed input. Reading it as usual.")
+
+    def stop_mapping(self) -> None:
+        """Closes the memory map opened by `.start_mapping()`, if any."""
+
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+
+    def reads_stream(self) -> bool:
+        """Whether the input is standard input ("-"), a pipe or anything
+            else that is not a regular file, and so can only be read once,
+            from the start. See `.stream_sections()`."""
+
+        if self._in_file == "-":
+            return True
+
+        try:
+            return not stat.S_ISREG(os.stat(self._in_file).st_mode)
+        except OSError:
+            return False
+
+    def stream_sections(self, parse=True) -> Iterator[Tuple[str, object]]:
+        """Reads a stream input once, yielding each wanted section as soon
+            as it has arrived in full, i.e. once the next "#" line (or the
+            end of the stream) has been read. See `.scan_and_parse()`.
+
+            Nothing is indexed or cached, as the stream cannot be read
+            again. Exits with an error message if the input cannot be
+            opened.
+
+            Args:
+                parse:
+                    Whether to parse the sections. If not, their raw bytes
+                    are yielded instead, header line included.
+
+            Yields:
+                The (lower case) name of the section and the parsed
+                `Section` (or its bytes), in file order.
+            """
+
+        if self._use_sidecar or self._cache is not None:
+            warn(self._verbose,
+                 "--index and --cache-dir are ignored when reading from a stream.")
+            self._use_sidecar = False
+            self._cache = None
+
+        try:
+            source = sys.stdin.buffer if self._in_file == "-" \
+                else open(self._in_file, "rb")
+            self._compression, stats_file = open_pipe(source, self._threads)
+        except FileNotFoundError:
+            error("No such file")
+            sys.exit(1)
+        except ImportError as exception:
+            error(str(exception))
+            sys.exit(1)
+
+        with stats_file:
+            yield from self.scan_and_parse(stats_file, parse)
+
+    def scan(self) -> SectionIndex:
+        """Indexes the .vchk file without parsing any of its sections.
+
+            Without `--index` or `--cache-dir`, only as far as the last
+            wanted section. See `.scan_index()`.
+
+            Tries opening the file and exits with an error message if file
+            cannot be found.
+
+            Returns:
+                The `SectionIndex` of the file.
+            """
+
         try:
-            with open(self._in_file, "r", encoding="utf-8") as stats_file:
-
-                stats_file_object = StatsFileObject()
-
-                for line in stats_file:
-
-                    # Is this line a header to a stats section?
-                    match = FileHandler.SECTION_HEADER_PATTERN.match(line)
-                    if match:
-                        # If so, retrieve the section "title"
-                        # and the names of the columns.
-                        line_split = line.split("\t")
-                        data_type_title = line_split[0][2:].lower()
-                        columns = list(
-                            map(self.check_and_clean, line_split[1:]))
-
-                        # Only go to the trouble of parsing the section if
-                        # the user has requested to view the stats of this
-                        # section.
-                        if data_type_title in self._actions or data_type_title == "sn":
-                            section = Section(data_type_title, columns, line)
-
-                            # The following will implicitly call `next` on the `stats_file`
-                            # iterator. So when section is done parsing,
-                            # this loop will resume and start looking for
-                            # headers again.
-                            try:
-                                section = section.parse(stats_file)
-                                stats_file_object.add_section(
-                                    data_type_title, section)
-                            except IOError:
-                                self._actions.remove(data_type_title)
-                                error(
-                                    f"Could not parse section {data_type_title} properly")
-
-                return stats_file_object
+            with self.open_input() as stats_file:
+                self._index = self.build_index(stats_file)
+
+                return self._index
 
         except FileNotFoundError:
             error("No such file")
             sys.exit(1)
 
+    def copy_section_text(self, name, out_dir) -> None:
+        """Copies the raw text of a section to `<out_dir>/<name>/<name>.txt`.
+
+            The section's bytes are copied straight from the input file, so
+            the section is never parsed. Call `.scan()` first.
+
+            Args:
+                name:
+                    The (lower case) name of the section. E.g. "tstv".
+                out_dir:
+                    The base out directory.
+            """
+
+        span = self._index.get(name)
+        if span is None:
+            error(f"No section {name} in file")
+            return
+
+        if span.start in self._retained:
+            write_as_bytes(out_dir, name, self._retained[span.start])
+            return
+
+        try:
+            with self.open_input() as stats_file:
+                self.seek_span(stats_file, span)
+                copy_byte_range(stats_file, span.start, span.length,
+                                f"{out_dir}/{name}/{name}.txt")
+        except IOError:
+            error(f"Could not write to file {out_dir}/{name}.txt")
+
+    def read_section_bytes(self, name) -> bytes:
+        """Returns the raw bytes of a section, header line included.
+            Call `.scan()` first.
+
+            Args:
+                name:
+                    The (lower case) name of the section. E.g. "sn".
+            """
+
+        span = self._index.get(name)
+        if span is None:
+            return b""
+        if span.start in self._retained:
+            return self._retained[span.start]
+
+        with self.open_input() as stats_file:
+            self.seek_span(stats_file, span)
+
+            return stats_file.read(span.length)
+
+    def open_input(self):
+        """Opens the .vchk file in binary mode, decompressing it as it is
+            read if it is compressed. See `compressed_input.open_input`.
+
+            Exits with an error message if the file cannot be
+            decompressed.
+
+            Raises:
+                FileNotFoundError:
+                    If there is no such file. Handled by the caller.
+            """
+
+        self._compression = detect_compression(self._in_file)
+
+        try:
+            return open_input(self._in_file, self._threads)
+        except ImportError as exception:
+            error(str(exception))
+            sys.exit(1)
+
+    def outstanding_sections(self) -> set:
+        """The sections still to be read before the rest of the file can
+            be skipped: all the wanted ones. See `.wants_section()`.
+
+            bcftools writes each section once, so once they have all been
+            read nothing else in the file is needed. A wanted section that
+            is missing from the file means it is read to the end.
+            """
+
+        return set(self._actions) | {"sn"}
+
+    def wants_section(self, name) -> bool:
+        """Whether the section called `name` needs to be parsed.
+
+            Only go to the trouble of parsing a section if the user has
+            requested to view its stats. The summary numbers are always
+            printed.
+            """
+
+        return name in self._actions or name == "sn"
+
+    @staticmethod
+    def seek_span(stats_file, span) -> None:
+        """Moves to the start of a section, using its virtual offset if
+            the file is BGZF compressed and the offset is known."""
+
+        if span.virtual_start is not None and isinstance(stats_file, BgzfReader):
+            stats_file.seek_virtual(span.virtual_start, span.start)
+        else:
+            stats_file.seek(span.start)
+
+    def map_file(self, stats_file):
+        """Memory-maps the .vchk file for reading.
+
+            Args:
+                stats_file:
+                    The .vchk file, opened by `.open_input()`.
+
+            Returns:
+                The `mmap.mmap`, or `None` if the file cannot be mapped
+                (e.g. it is empty), in which case sections are read as usual.
+            """
+
+        try:
+            return mmap.mmap(stats_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            warn(self._verbose,
+                 f"Could not memory-map {self._in_file}. Reading it as usual.")
+            return None
+
+    def build_index(self, stats_file) -> SectionIndex:
+        """Scans the .vchk file for its sections.
+
+            If asked to, reuses the sidecar index next to the input file
+            instead. A missing or stale sidecar (the input's size or
+            modification time have changed) is rebuilt and rewritten.
+
+            Args:
+                stats_file:
+                    The .vchk file, opened by `.open_input()`.
+
+            Returns:
+                The `SectionIndex` of the file.
+            """
+
+        # Cached sections are keyed by the content hash.
+        if not self._use_sidecar:
+            return self.scan_index(stats_file, digest=self._cache is not None)
+
+        sidecar = self._in_file + SIDECAR_SUFFIX
+        source_stat = os.stat(self._in_file)
+
+        index = SectionIndex.load(sidecar, source_stat)
+        if index is None:
+            index = self.scan_index(stats_file, digest=True)
+
+            try:
+                index.save(sidecar, source_stat)
+            except OSError:
+                warn(self._verbose,
+                     f"Could not write index file {sidecar}. Continuing without it.")
+
+        return index
+
+    def scan_index(self, stats_file, digest) -> SectionIndex:
+        """Scans the (decompressed) .vchk file for its sections.
+
+            A gzip or zstd stream cannot seek back without decompressing
+            it all over again, so the wanted sections are kept as the
+            scan reads past them. Spans of a BGZF file get their virtual
+            offsets.
+
+            Args:
+                stats_file:
+                    The .vchk file, opened by `.open_input()`.
+                digest:
+                    Whether to also hash the content of the file.
+
+            Returns:
+                The `SectionIndex` of the file. Without `digest`, only up
+                to the last wanted section.
+            """
+
+        # A content hash has to see the whole file. Otherwise stop once
+        # every wanted section has been found.
+        until = None
+        if not digest:
+            outstanding = self.outstanding_sections()
+
+            def until(span):
+                outstanding.discard(span.name)
+                return not outstanding
+
+        on_span = None
+        if isinstance(stats_file, SequentialReader):
+            stats_file.keep()
+
+            def on_span(span):
+                if self.wants_section(span.name):
+                    self._retained[span.start] = stats_file.kept(span.start,
+                                                                 span.end)
+                stats_file.release(span.end)
+
+        index = SectionIndex.scan(stats_file, digest=digest, on_span=on_span,
+                                  until=until)
+
+        if isinstance(stats_file, BgzfReader):
+            for span in index:
+                span.virtual_start = stats_file.virtual_offset(span.start)
+
+        return index
+
+    def load_section(self, stats_file, span):
+        """Loads a single section from the cache, or parses it (and
+            caches it) on a miss.
+
+            Args:
+                stats_file:
+                    The .vchk file, opened by `.open_input()`.
+                span:
+                    The `SectionSpan` of the section to load.
+
+            Returns:
+                The parsed `Section`.
+            """
+
+        if self._cache is None:
+            return self.parse_span(stats_file, span)
+
+        digest = self._index.get_digest()
+        with phase("load_cached_section", section=span.name) as record:
+            cached = self._cache.load(digest, span.name, PARSER_VERSION)
+            if record is not None:
+                record.attributes["hit"] = cached is not None
+            if cached is not None:
+                return Section.from_cache(span.name, *cached)
+
+        section = self.parse_span(stats_file, span)
+
+        try:
+            self._cache.store(digest, span.name, PARSER_VERSION,
+                              section.get_columns(), section.cache_columns(),
+                              "".join(section.get_text()))
+        except OSError:
+            warn(self._verbose,
+                 f"Could not cache section {span.name}. Continuing.")
+
+        return section
+
+    def parse_span(self, stats_file, span):
+        """Seeks to a single section of the .vchk file and parses it.
+
+            Args:
+                stats_file:
+                    The .vchk file, opened by `.open_input()`.
+                span:
+                    The `SectionSpan` of the section to parse.
+
+            Returns:
+                The parsed `Section`.
+            """
+
+        return self.parse_raw(span, self.read_span(stats_file, span))
+
+    def read_span(self, stats_file, span) -> bytes:
+        """Reads the bytes of a single section, header line included.
+
+            Args:
+                stats_file:
+                    The .vchk file, opened by `.open_input()`.
+                span:
+                    The `SectionSpan` of the section to read.
+            """
+
+        # Kept while scanning a gzip or zstd stream.
+        raw = self._retained.pop(span.start, None)
+
+        if raw is None and self._mapped is not None:
+            # Only this section is copied out of the map.
+            raw = self._mapped[span.start:span.end]
+        elif raw is None:
+            self.seek_span(stats_file, span)
+            raw = stats_file.read(span.length)
+
+        return raw
+
+    def parse_raw(self, span, raw):
+        """Parses a single section from its bytes.
+
+            Args:
+                span:
+                    The `SectionSpan` of the section.
+                raw:
+                    The bytes of the whole section, header line included.
+
+            Returns:
+                The parsed `Section`.
+            """
+
+        # Decode exactly as reading the file in text mode would.
+        lines = io.TextIOWrapper(io.BytesIO(raw), encoding="utf-8")
+
+        # Retrieve the section "title" and the names of the columns.
+        header = next(lines)
+        line_split = header.split("\t")
+        columns = list(map(self.check_and_clean, line_split[1:]))
+
+        section = Section(span.name, columns, header)
+
+        if self._mapped is not None and section.parse_bytes(
+                raw, span.data_start - span.start) is not None:
+            return section
+
+        return section.parse(lines)
+
+    def get_index(self) -> SectionIndex:
+        """Accessor for the `SectionIndex` built by the last `.parse()`."""
+        return self._index
+
     def check_and_clean(self, line_to_clean) -> str:
         """Beautifies the column name by removing index in square brackets.
 
@@ -217,8 +808,8 @@ def coerce_to_appropriate_dtype(val):
       all values as type Object when a Dataframe is instantiated
       from a list of lists of strings.
 
-      Way to do this through Pandas?
-      #TODO: ?
+      Only used as a fallback by `coerce_column` for cells that
+      cannot be typed in bulk.
 
       E.g.
           `"3" : str -> 3 : int`
@@ -233,13 +824,212 @@ def coerce_to_appropriate_dtype(val):
     return val
 
 
+# Patterns for cells that `ast.literal_eval` would read as an int or a float.
+# Ints with a leading zero (e.g. "007") are *not* valid Python literals, so
+# are excluded. Ints are capped at 18 digits so they always fit into an int64.
+INT_CELL_PATTERN = r"[-+]?(?:0|[1-9]\d{0,17})"
+FLOAT_CELL_PATTERN = (r"[-+]?(?:0|[1-9]\d{0,17}"
+                      r"|(?:\d+\.\d*|\.\d+)(?:[eE][-+]?\d+)?"
+                      r"|\d+[eE][-+]?\d+)")
+
+# Cells that start like an identifier, contain no quotes or brackets and
+# are not a keyword constant can never be a Python literal, so they are
+# always kept as the raw string.
+PLAIN_STRING_CELL_PATTERN = r"(?!True|False|None)[A-Za-z_][^'\"(]*"
+
+
+def coerce_column(values):
+    """Types a whole column of strings in one go.
+
+      Looks at the column once and decides whether every cell is an
+      int, every cell is a number, or neither. Numeric columns are then
+      converted in a single vectorised NumPy pass. Any other column falls
+      back to `coerce_to_appropriate_dtype`, but only for the cells that
+      could possibly be a literal.
+
+      The result is the same as calling `coerce_to_appropriate_dtype`
+      on every cell and letting Pandas infer the column's dtype.
+
+      Args:
+          values:
+              A sequence of the (str) cells of a single column.
+
+      Returns:
+          Either a NumPy array (int64 or float64) or a list of Python
+          objects for Pandas to infer a dtype from.
+      """
+
+    cells = pd.Series(values, dtype=object)
+
+    if cells.str.fullmatch(INT_CELL_PATTERN).all():
+        return np.asarray(values, dtype=str).astype(np.int64)
+
+    is_number = cells.str.fullmatch(FLOAT_CELL_PATTERN)
+    if is_number.all():
+        return np.asarray(values, dtype=str).astype(np.float64)
+
+    # Mixed column, e.g. the DP bins `0, 1, ..., >500`.
+    is_plain_string = cells.str.fullmatch(PLAIN_STRING_CELL_PATTERN)
+
+    return [
+        cell if plain else coerce_to_appropriate_dtype(cell)
+        for cell, plain in zip(values, is_plain_string)
+    ]
+
+
+# Byte values used by `split_byte_columns` and `type_byte_column`.
+TAB = ord("\t")
+NEWLINE = ord("\n")
+SPACE = ord(" ")
+ZERO, NINE = ord("0"), ord("9")
+SIGN_BYTES = np.frombuffer(b"+-", dtype=np.uint8)
+FLOAT_BYTES = np.frombuffer(b"0123456789+-.eE", dtype=np.uint8)
+
+# Largest (cells x widest cell) byte matrix built to type a column in bulk.
+MAX_CELL_MATRIX_BYTES = 64 << 20
+
+
+def split_byte_columns(data, n_columns):
+    """Splits the rows of a section into columns without decoding them.
+
+      Finds every tab and newline of the section in one NumPy pass, so
+      rows and cells are only ever offsets into `data`. Each column is
+      then typed straight from its bytes by `type_byte_column`.
+
+      Only handles sections of plain ASCII with no stray white space,
+      i.e. the usual tab separated output. Returns `None` for anything
+      else so the caller can fall back to decoding the text.
+
+      Args:
+          data:
+              A uint8 NumPy array of the section's rows, header excluded.
+          n_columns:
+              The number of columns the section should have.
+
+      Returns:
+          One entry per column (see `type_byte_column`), or `None`.
+
+      Raises:
+          IOError:
+              If a row does not have `n_columns` cells. Handled by the
+              caller.
+      """
+
+    if not len(data) or not n_columns:
+        return None
+
+    # Control characters (e.g. "\r") and anything that is not ASCII.
+    if ((data < SPACE) & (data != TAB) & (data != NEWLINE)).any() \
+            or (data > 126).any():
+        return None
+
+    newlines = np.flatnonzero(data == NEWLINE)
+    line_ends = newlines if data[-1] == NEWLINE \
+        else np.append(newlines, len(data))
+    line_starts = np.concatenate(([0], newlines + 1))[:len(line_ends)]
+
+    # Blank lines, or lines that `str.strip` would change.
+    if ((line_ends <= line_starts).any()
+            or (data[line_starts] == SPACE).any()
+            or np.isin(data[line_ends - 1], (SPACE, TAB)).any()):
+        return None
+
+    # Every row is the title followed by one cell per column.
+    tabs = np.flatnonzero(data == TAB)
+    tabs_per_line = (np.searchsorted(tabs, line_ends)
+                     - np.searchsorted(tabs, line_starts))
+    if (tabs_per_line != n_columns).any():
+        raise IOError(
+            "File not in the correct format. Missing a data point")
+
+    tabs = tabs.reshape(len(line_starts), n_columns)
+    cell_ends = np.column_stack((tabs[:, 1:], line_ends))
+
+    return [
+        type_byte_column(data, tabs[:, position] + 1, cell_ends[:, position])
+        for position in range(n_columns)
+    ]
+
+
+def type_byte_column(data, starts, ends):
+    """Types a single column of cells given as byte offsets.
+
+      Gives the same result as `coerce_column` on the decoded cells. Int
+      and float columns are converted from a fixed width bytes array in a
+      single pass and are never decoded. Any other column is decoded and
+      left to `coerce_column`.
+
+      Args:
+          data:
+              A uint8 NumPy array of the section's rows.
+          starts:
+              The offset in `data` of each cell of the column.
+          ends:
+              The offset in `data` just past each cell of the column.
+
+      Returns:
+          Either a NumPy array (int64 or float64) or a list of the raw
+          (str) cells.
+      """
+
+    widths = ends - starts
+    width = int(widths.max())
+
+    if width == 0 or len(starts) * width > MAX_CELL_MATRIX_BYTES:
+        return [bytes(data[start:end]).decode("ascii")
+                for start, end in zip(starts, ends)]
+
+    # One row of bytes per cell, padded with zeros, viewed as a NumPy
+    # bytes ("S") array.
+    offsets = np.arange(width)
+    in_cell = offsets < widths[:, None]
+    characters = np.where(
+        in_cell, data[np.minimum(starts[:, None] + offsets, len(data) - 1)], 0
+    ).astype(np.uint8)
+    cells = characters.view(f"S{width}").ravel()
+
+    # The same rules as `INT_CELL_PATTERN` and `FLOAT_CELL_PATTERN`.
+    signed = np.isin(characters[:, 0], SIGN_BYTES)
+    digit_count = widths - signed
+    first_digit = characters[np.arange(len(cells)),
+                             np.minimum(signed, width - 1)]
+    is_digit = (characters >= ZERO) & (characters <= NINE)
+
+    all_digits = (is_digit | ~(in_cell & (offsets >= signed[:, None]))) \
+        .all(axis=1) & (digit_count > 0)
+    not_int_literal = ((first_digit == ZERO) & (digit_count > 1)) \
+        | (digit_count > 18)
+
+    if (all_digits & ~not_int_literal).all():
+        return cells.astype(np.int64)
+
+    could_be_float = (np.isin(characters, FLOAT_BYTES) | ~in_cell).all(axis=1)
+    if (could_be_float & ~(all_digits & not_int_literal)).all():
+        try:
+            return cells.astype(np.float64)
+        except ValueError:
+            # E.g. "1e" or "+-1".
+            pass
+
+    return [cell.decode("ascii") for cell in cells.tolist()]
+
+
 class Section:
     """Represents an individual section from a .vchk file.
 
       Attributes:
           _title: The name of this section. Internal class use only.
           _columns: A list of column names
-          _rows: A list of all rows
+          _rows: A list of all rows, as the raw (str) cells
+          _byte_columns: The typed columns, when parsed by `.parse_bytes()`
+              rather than row by row.
+          _raw_text: The undecoded bytes of this section, until its text
+              is first asked for.
+          _page: The number of this page of a section, if it is one. See
+              `.get_pages()`.
+          _sets: The data, split by set. See `.get_sets()`.
+          _set: The id of the set a page is of, if the section has more
+              than one set. See `.get_pages()`.
 
       """
 
@@ -251,8 +1041,13 @@ class Section:
         self._plotter = None
         self._rows = []
         self._text_rows = [header]
+        self._byte_columns = None
+        self._raw_text = None
+        self._page = None
 
         self._data_frame = None
+        self._sets = None
+        self._set = None
 
     def accept_row(self, row) -> None:
         """Parses a new row.
@@ -281,10 +1076,9 @@ class Section:
             raise IOError(
                 "File not in the correct format. Missing a data point")
 
-        # Cheap hack. See docs for `coerce_to_appropriate_dtype`.
-        self._rows.append([
-            coerce_to_appropriate_dtype(split) for split in split_on_delimiter
-        ])
+        # Cells are typed a column at a time once the section
+        # has been read. See `coerce_column`.
+        self._rows.append(split_on_delimiter)
 
     def parse(self, file_line_iterator):
         """Takes an iterator over the lines of the .vchk file
@@ -302,43 +1096,357 @@ class Section:
                 as a pandas DataFrame.
             """
 
-        # Advance the iterator by reading the next line.
-        next_line = next(file_line_iterator, None)
+        with phase("parse_section", section=self._title) as record:
 
-        # The non-header lines of a section do not begin with a '#'
-        # so can use this as a termination condition.
-        while next_line is not None and not next_line.startswith("#"):
+            # Advance the iterator by reading the next line.
+            next_line = next(file_line_iterator, None)
 
-            # Append the raw text and then separately clean the line
-            # so it can be interpreted by pandas.
-            self._text_rows.append(next_line)
-            self.accept_row(next_line.strip().replace("\n", ""))
+            # The non-header lines of a section do not begin with a '#'
+            # so can use this as a termination condition.
+            while next_line is not None and not next_line.startswith("#"):
 
-            # Advance the iterator to parse the next line
-            next_line = next(file_line_iterator, None)
+                # Append the raw text and then separately clean the line
+                # so it can be interpreted by pandas.
+                self._text_rows.append(next_line)
+                self.accept_row(next_line.strip().replace("\n", ""))
+
+                # Advance the iterator to parse the next line
+                next_line = next(file_line_iterator, None)
+
+            self._data_frame = self.build_data_frame()
+
+            if record is not None:
+                record.attributes["rows"] = len(self._rows)
+                record.attributes["columns"] = len(self._columns)
+
+        return self
+
+    def parse_bytes(self, raw, data_start):
+        """Parses the rows of this section straight from its bytes.
+
+            See `split_byte_columns`. The text of the section is only
+            decoded when `.get_text()` is first called.
+
+            Args:
+                raw:
+                    The bytes of the whole section, header line included.
+                data_start:
+                    The offset in `raw` of the first row.
+
+            Returns:
+                This section, or `None` if it could not be parsed from
+                its bytes and has to be parsed with `.parse()` instead.
+
+            Raises:
+                IOError:
+                    If the file is not in the correct format. Handled
+                    by the caller.
+            """
+
+        with phase("parse_section", section=self._title, mapped=True) as record:
+
+            data = np.frombuffer(raw, dtype=np.uint8)[data_start:]
 
-        self._data_frame = pd.DataFrame(columns=self._columns,
-                                        data=self._rows,
-                                        dtype=None)
+            data_columns = split_byte_columns(data, len(self._columns))
+            if data_columns is None:
+                return None
+
+            self._byte_columns = data_columns
+            self._raw_text = raw
+            self._data_frame = Section.frame_from_columns(self._columns,
+                                                          data_columns)
+
+            if record is not None:
+                record.attributes["rows"] = len(self._data_frame)
+                record.attributes["columns"] = len(self._columns)
 
         return self
 
-    def plot_and_write_file(self, out_dir):
-        """Plots this section using the appropriate plotter
+    @staticmethod
+    def from_cache(title, columns, data_columns, text):
+        """Rebuilds a parsed `Section` from a `SectionCache` entry.
+
+            Args:
+                title:
+                    The name of the section.
+                columns:
+                    The column names.
+                data_columns:
+                    One entry per column. Either a (memory-mapped) numeric
+                    array or a list of the column's raw (str) cells.
+                text:
+                    The raw text of the section.
+
+            Returns:
+                The `Section`, as if it had just been parsed.
+            """
+
+        text_rows = list(io.StringIO(text, newline="\n"))
+
+        section = Section(title, columns, text_rows[0])
+        section._text_rows = text_rows
+        section._data_frame = Section.frame_from_columns(columns, data_columns)
+
+        return section
+
+    @staticmethod
+    def frame_from_columns(columns, data_columns) -> pd.DataFrame:
+        """Builds a DataFrame from a list of columns.
+
+            Each column of raw cells is typed in one pass by `coerce_column`
+            rather than cell by cell. Columns that are already NumPy arrays
+            are used as they are, without copying.
+
+            Args:
+                columns:
+                    The column names.
+                data_columns:
+                    One entry per column, either a NumPy array or a sequence
+                    of raw (str) cells.
+
+            Returns:
+                The data as a pandas DataFrame.
+            """
+
+        if not data_columns or not len(data_columns[0]):
+            return pd.DataFrame(columns=columns, data=[], dtype=None)
+
+        # Key the columns by position so duplicate names survive, then
+        # restore the real names.
+        data_frame = pd.DataFrame({
+            position: column if isinstance(column, np.ndarray)
+            else coerce_column(column)
+            for position, column in enumerate(data_columns)
+        }, copy=False)
+        data_frame.columns = columns
+
+        return data_frame
+
+    def build_data_frame(self) -> pd.DataFrame:
+        """Builds the DataFrame for this section from its accepted rows.
+
+            Returns:
+                The data of this section as a pandas DataFrame.
+            """
+
+        return Section.frame_from_columns(self._columns,
+                                          list(zip(*self._rows)))
+
+    def cache_columns(self) -> list:
+        """Returns the columns of this section in the form a `SectionCache`
+            stores them.
+
+            Returns:
+                One entry per column. The typed array for int and float
+                columns, otherwise the list of raw (str) cells.
+            """
+
+        raw_columns = self._byte_columns if self._byte_columns is not None \
+            else zip(*self._rows)
+
+        return [
+            self._data_frame.iloc[:, position].to_numpy()
+            if self._data_frame.iloc[:, position].dtype.kind in "if"
+            else list(raw_column)
+            for position, raw_column in enumerate(raw_columns)
+        ]
+
+    def plot_and_write_file(self, out_dir, output_options=None, verbose=False,
+                            samples_per_page=None):
+        """Plots this section using the appropriate plotter and writes
+        its text.
 
         Args:
             out_dir:
                 The base out directory.
+            output_options:
+                Optional dict of image format settings for the plotter.
+                See `DataPlotter.__init__`.
+            verbose:
+                Whether to report how long the image took to encode and
+                how big it is.
+            samples_per_page:
+                If given, plot this (per-sample) section as pages of this
+                many samples, one after another, and write an index of
+                them. See `.get_pages()`.
+        """
+
+        if samples_per_page:
+            pages = self.get_pages(samples_per_page)
+            for page in pages:
+                page.plot_and_save(out_dir, output_options, verbose)
+
+            self.write_page_index(out_dir, pages, output_options)
+        else:
+            self.plot_and_save(out_dir, output_options, verbose)
+
+        self.write_text(out_dir)
+
+    def plot_and_save(self, out_dir, output_options=None, verbose=False):
+        """Plots this section (or page of a section) using the
+        appropriate plotter and saves the plot.
+
+        Args:
+            See `.plot_and_write_file()`.
         """
 
+        output_options = dict(output_options or {})
+        attributes = {}
+        if self._page is not None:
+            output_options["page"] = attributes["page"] = self._page
+        if self._set is not None:
+            output_options["page_set"] = attributes["set"] = self._set
+
+        sets = self.get_sets()
+        if len(sets) > 1:
+            output_options["sets"] = sets
+
         self._plotter = DataPlotter.get_plotter(self._title, self._data_frame,
-                                                out_dir)
+                                                out_dir, **output_options)
 
         if self._plotter is not None:
-            self._plotter.plot().save()
+            with phase("plot", section=self._title, **attributes):
+                self._plotter.plot_sets()
+
+            with phase("save", section=self._title, **attributes) as record:
+                self._plotter.save()
+
+            report = self._plotter.get_save_report()
+            if report is not None:
+                path, seconds, size = report
+                info(verbose,
+                     f"Wrote {path} ({size / 1e6:.2f} MB) in {seconds:.2f}s")
+
+                if record is not None:
+                    record.attributes["path"] = path
+                    record.attributes["bytes"] = size
+                    record.attributes["format"] = os.path.splitext(path)[1][1:]
+
+    def write_text(self, out_dir):
+        """Writes the raw text of this section to its .txt file.
+
+        Args:
+            out_dir:
+                The base out directory.
+        """
+
+        with phase("write_text", section=self._title):
+            write_as_text(out_dir, self._title, self.get_text())
+
+    def get_pages(self, samples_per_page) -> List["Section"]:
+        """Splits a per-sample section into pages, to be plotted (and
+        saved) one by one with `.plot_and_save()`.
+
+        Each page holds a copy of its own rows only, so it takes the same
+        time and memory to send to a worker and plot, however many samples
+        the section has.
+
+        A section with more than one set (see `.get_sets()`) is paginated
+        set by set, so no page mixes the samples of two sets. Pages are
+        numbered on from one set to the next.
+
+        Args:
+            samples_per_page:
+                The most samples on one page.
+
+        Returns:
+            A `Section` per page, in order. Pages have no text.
+        """
+
+        sets = self.get_sets()
+
+        pages = []
+        for set_id, rows in sets.items():
+            for start in range(0, len(rows), samples_per_page):
+                page = Section(self._title, self._columns, None)
+                page._text_rows = []
+                page._data_frame = rows \
+                    .iloc[start:start + samples_per_page] \
+                    .reset_index(drop=True)
+                page._page = len(pages) + 1
+                if len(sets) > 1:
+                    page._set = set_id
+
+                pages.append(page)
 
-        write_as_text(out_dir, self._title, self._text_rows)
+        return pages
+
+    def write_page_index(self, out_dir, pages, output_options=None):
+        """Writes an index of the given pages of this section. See
+        `write_page_index` in `utils`.
+
+        Args:
+            out_dir:
+                The base out directory.
+            pages:
+                The pages that were plotted. See `.get_pages()`.
+            output_options:
+                The output options the pages were plotted with, for
+                their file format.
+        """
+
+        file_format = (output_options or {}).get("file_format", "tiff")
+
+        write_page_index(out_dir, self._title, [
+            {
+                "page": page._page,
+                "set": page._set,
+                "file": page_file_name(self._title, page._page, file_format),
+                "samples": len(page._data_frame),
+                "first_sample": str(page._data_frame["sample"].iloc[0]),
+                "last_sample": str(page._data_frame["sample"].iloc[-1]),
+            }
+            for page in pages
+        ])
+
+    def get_sets(self) -> Dict[object, pd.DataFrame]:
+        """Splits the data of this section by its "id" column.
+
+        `bcftools stats` given more than one file writes a set of rows
+        per file (and per intersection of the files) to most sections,
+        each with its own "id". The split is made once, in one pass over
+        the data, and kept.
+
+        Returns:
+            A DataFrame per set, keyed by id in the order the sets appear,
+            each indexed from 0 as if it were the whole section. A section
+            with a single set (or no "id" column) is returned whole, as
+            set 0.
+        """
+
+        if self._sets is None:
+            frame = self._data_frame
+
+            if "id" in frame.columns and frame["id"].nunique() > 1:
+                self._sets = {
+                    set_id: rows.reset_index(drop=True)
+                    for set_id, rows in frame.groupby("id", sort=False)
+                }
+            else:
+                self._sets = {0: frame}
+
+        return self._sets
 
     def get_text(self) -> List[str]:
         """Accesser method for the private raw text of this section"""
+
+        if self._raw_text is not None:
+            self._text_rows = list(io.TextIOWrapper(io.BytesIO(self._raw_text),
+                                                    encoding="utf-8"))
+            self._raw_text = None
+
         return self._text_rows
+
+    def get_columns(self) -> List[str]:
+        """Accesser method for the column names of this section"""
+        return self._columns
+
+    def get_page(self):
+        """Accesser method for the page number of this section, if it is a
+        page of a section. See `.get_pages()`."""
+        return self._page
+
+    def get_set(self):
+        """Accesser method for the id of the set this page is of, if it is
+        a page of a section with more than one set. See `.get_pages()`."""
+        return self._set
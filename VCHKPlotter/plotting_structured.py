@@ -20,16 +20,20 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import functools
 import logging
+import os
+import time
 import warnings
+import weakref
 from abc import ABC, abstractmethod
 
-import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
-from mne.viz import plot_connectivity_circle
 
+from .palettes import desaturate, palette_colours
+from .sample_summary import (DEFAULT_MAX_SAMPLES, HEATMAP_COLUMNS,
+                             OUTLIER_SCORE, binned_summary, cluster_order,
+                             quantile_summary, scale_columns, top_outliers)
 from .utils import warn
 
 # DON'T LET USER KNOW ABOUT MISTAKES I'VE MADE!!!
@@ -46,15 +50,371 @@ A class system in which each subclass (or graph plotter for a specific type
 of chart) inherits style parameters and a common method to save the figure
 to a given location on disk.
 
+Matplotlib and seaborn are slow to import, so each is only imported the
+first time a plotter that needs it is used. See `pyplot()` and `seaborn()`.
+
+Figures are built directly as `matplotlib.figure.Figure` objects, not
+through pyplot, so nothing keeps them alive once a plotter is done with
+them. See `FigurePool`.
+
+The per-sample sections (PSC and PSI) are summarised rather than drawn
+sample by sample once there are more than `max_samples` samples. See
+`PerSamplePlotter`.
+
+Sections holding more than one set of rows (`bcftools stats` given more
+than one file) draw each set side by side on one figure. See
+`DataPlotter.plot_sets()`.
+
 Typical usage example:
     x = SubstitutionPlotter(data, out_dir, type)
     x.plot().save()
 """
 
-# Define some global parameters. Use sparingly.
-plt.rcParams["figure.figsize"] = 15, 10
 logging.getLogger("matplotlib.font_manager").disabled = True
 
+# Image formats a plot can be saved as. The raster formats are encoded by
+# Pillow, which takes the compression / quality settings.
+OUTPUT_FORMATS = ("tiff", "png", "jpeg", "webp", "svg", "pdf")
+RASTER_FORMATS = ("tiff", "png", "jpeg", "webp")
+
+# Width and height of every plot, in inches.
+FIGURE_SIZE = 15, 10
+
+# Sections with one row per sample. See `PerSamplePlotter`.
+PER_SAMPLE_SECTIONS = ("psc", "psi")
+
+
+def page_file_name(image_type, page, file_format) -> str:
+    """The name of the image of one page of a per-sample section.
+    E.g. "psc_page0003.png". See `PerSamplePlotter`."""
+
+    return f"{image_type}_page{page:04d}.{file_format}"
+
+
+@functools.lru_cache(maxsize=None)
+def pyplot():
+    """Imports `matplotlib.pyplot` on first use.
+
+    Returns:
+        The `matplotlib.pyplot` module.
+    """
+
+    import matplotlib.pyplot as plt
+
+    # Define some global parameters. Use sparingly.
+    plt.rcParams["figure.figsize"] = FIGURE_SIZE
+
+    return plt
+
+
+@functools.lru_cache(maxsize=None)
+def seaborn():
+    """Imports `seaborn` (and so `matplotlib.pyplot`) on first use.
+
+    Returns:
+        The `seaborn` module.
+    """
+
+    pyplot()
+    import seaborn as sns
+
+    return sns
+
+
+@functools.lru_cache(maxsize=None)
+def figure_class():
+    """Imports `matplotlib.figure.Figure` on first use.
+
+    Returns:
+        The `matplotlib.figure.Figure` class.
+    """
+
+    from matplotlib.figure import Figure
+
+    return Figure
+
+
+@functools.lru_cache(maxsize=None)
+def bar_colours(palette, n_colours, saturation=0.75):
+    """The colours `sns.barplot` gives `n_colours` bars drawn with the
+    named palette, including its default desaturation.
+
+    Palettes in `palettes.PALETTES` are sampled without importing seaborn;
+    any other palette is looked up in seaborn.
+
+    Returns:
+        A tuple of RGB tuples.
+    """
+
+    colours = palette_colours(palette, n_colours)
+
+    if colours is None:
+        sns = seaborn()
+        colours = sns.color_palette(palette, n_colours)
+
+    return tuple(desaturate(colour, saturation) for colour in colours)
+
+
+def draw_chord_circle(axis, matrix, node_names, node_angles, node_colors,
+                      colormap="hot", textcolor="black", node_edgecolor="black",
+                      linewidth=1.5, title=None, fontsize_title=12,
+                      fontsize_names=8, fontsize_colorbar=8):
+    """Draws a circular chord plot of the connections between some nodes.
+
+    Draws the same plot as `mne.viz.plot_connectivity_circle` did for the
+    lower triangle of a square matrix: each connection is a Bezier curve
+    between two nodes on a ring, coloured by its strength, with a colour
+    bar next to the ring. All the curves are drawn as one `PathCollection`.
+
+    Args:
+        axis:
+            The polar axis to draw on.
+        matrix:
+            The square matrix of connection strengths. Only the lower
+            triangle is drawn. NaN means there is no connection.
+        node_names:
+            The label of each node.
+        node_angles:
+            Where each node is on the ring, in degrees.
+        node_colors:
+            The colour of each node.
+        colormap:
+            The name of the colormap that colours the connections.
+        textcolor:
+            The colour of the labels, title and colour bar labels.
+        node_edgecolor:
+            The colour of the borders between the nodes.
+        linewidth:
+            The width of the connections.
+        title:
+            The title of the plot, if any.
+        fontsize_title, fontsize_names, fontsize_colorbar:
+            The font sizes of the title, node labels and colour bar labels.
+    """
+
+    from matplotlib import colormaps
+    from matplotlib.cm import ScalarMappable
+    from matplotlib.collections import PathCollection
+    from matplotlib.colors import Normalize
+    from matplotlib.path import Path
+
+    n_nodes = len(node_names)
+    node_angles = np.asarray(node_angles) * np.pi / 180
+
+    # Each node is as wide as the smallest gap between two of them.
+    gaps = np.abs(node_angles[None, :] - node_angles[:, None])
+    gaps[np.diag_indices(n_nodes)] = np.inf
+    node_width = gaps.min()
+
+    # The connections, weakest first so the strongest are drawn on top.
+    starts, ends = np.tril_indices(n_nodes, -1)
+    strengths = np.asarray(matrix)[starts, ends]
+    drawn = ~np.isnan(strengths)
+    starts, ends, strengths = starts[drawn], ends[drawn], strengths[drawn]
+
+    order = np.argsort(np.abs(strengths))
+    starts, ends, strengths = starts[order], ends[order], strengths[order]
+
+    # Spread the ends of the connections of busy nodes out a little, the
+    # first (weakest) connections the most. Seeded so plots are repeatable.
+    rng = np.random.mtrand.RandomState(0)
+    noise_max = 0.25 * node_width
+    start_noise = rng.uniform(-noise_max, noise_max, len(strengths))
+    end_noise = rng.uniform(-noise_max, noise_max, len(strengths))
+
+    # How many connections each node has, and how many of them have been
+    # seen after each connection, counting both of its ends.
+    both_ends = np.column_stack([starts, ends]).ravel()
+    seen = np.cumsum(both_ends[:, None] == np.arange(n_nodes), axis=0)[1::2]
+    n_connections = seen[-1] if len(seen) else np.zeros(n_nodes, dtype=int)
+    connection = np.arange(len(strengths))
+
+    start_noise *= (n_connections[starts] - seen[connection, starts]) \
+        / n_connections[starts]
+    end_noise *= (n_connections[ends] - seen[connection, ends]) \
+        / n_connections[ends]
+
+    # A curve from the inside of the ring at one node, bending towards the
+    # middle, to the inside of the ring at the other.
+    start_angles = node_angles[starts] + start_noise
+    end_angles = node_angles[ends] + end_noise
+    vertices = np.stack([
+        np.column_stack([start_angles, np.full_like(start_angles, 10)]),
+        np.column_stack([start_angles, np.full_like(start_angles, 5)]),
+        np.column_stack([end_angles, np.full_like(end_angles, 5)]),
+        np.column_stack([end_angles, np.full_like(end_angles, 10)]),
+    ], axis=1)
+    codes = [Path.MOVETO, Path.CURVE4, Path.CURVE4, Path.LINETO]
+
+    cmap = colormaps[colormap]
+    norm = Normalize(strengths.min(), strengths.max())
+
+    axis.set_xticks([])
+    axis.set_yticks([])
+    axis.set_ylim(0, 16)
+    axis.spines["polar"].set_visible(False)
+
+    axis.add_collection(PathCollection(
+        [Path(curve, codes) for curve in vertices],
+        facecolors="none",
+        edgecolors=cmap(norm(strengths)),
+        linewidths=linewidth,
+    ))
+
+    # The ring of nodes.
+    axis.bar(node_angles, np.ones(n_nodes), width=node_width, bottom=9,
+             edgecolor=node_edgecolor, lw=2.0, color=node_colors,
+             align="center")
+
+    for name, angle in zip(node_names, node_angles):
+        rotation = np.degrees(angle)
+        alignment = "left"
+        if rotation < 270:
+            # Flip the label, so text is always upright.
+            rotation += 180
+            alignment = "right"
+
+        axis.text(angle, 10.4, name, size=fontsize_names, rotation=rotation,
+                  rotation_mode="anchor", horizontalalignment=alignment,
+                  verticalalignment="center", color=textcolor)
+
+    if title is not None:
+        axis.set_title(title, color=textcolor, fontsize=fontsize_title)
+
+    mappable = ScalarMappable(norm=norm, cmap=cmap)
+    mappable.set_array(np.linspace(norm.vmin, norm.vmax))
+    colorbar = axis.figure.colorbar(mappable, ax=axis, use_gridspec=False,
+                                    shrink=0.2, anchor=(-0.3, 0.1))
+    colorbar.ax.tick_params(labelsize=fontsize_colorbar,
+                            labelcolor=textcolor)
+
+
+# The figure layouts the plotters draw on. See `FigurePool.take()`.
+FIGURE_LAYOUTS = ("single", "twin", "shared_x", "3d", "polar")
+
+# The size of figures with a layout that is not `FIGURE_SIZE`, in inches.
+LAYOUT_SIZES = {"polar": (8, 8)}
+
+
+class FigurePool:
+    """Keeps the figures of saved plots so the next plot with the same
+    layout and style can be drawn on them instead of on a new figure.
+
+    A figure is taken from the pool by a plotter's `.plot()` and handed
+    back by its `.save()`. Before it is reused, it is cleared and given new
+    axes, so the plot comes out exactly as it would on a new figure. At most
+    one spare figure is kept per layout and style, so the pool never holds
+    more than a handful of (empty) figures, however many sections or files
+    are plotted.
+
+    The figures are not registered with pyplot, so one that is never handed
+    back (e.g. its plot failed) is simply garbage collected.
+
+      Attributes:
+          _spare: The figures that can be reused, keyed by (layout, style).
+          _in_use: The (layout, style) of each figure currently taken. Only
+              weakly refers to the figures.
+      """
+
+    def __init__(self) -> None:
+        """Initialises an empty pool."""
+
+        self._spare = {}
+        self._in_use = weakref.WeakKeyDictionary()
+
+    def take(self, layout="single", style=None):
+        """Returns a figure and its axes to plot on.
+
+        Call this inside the seaborn style context the plot is drawn in
+        (if any), so the axes pick up that style.
+
+        Args:
+            layout:
+                One of `FIGURE_LAYOUTS`: a single axis, an axis and its
+                twin sharing the x-axis ("twin"), two rows sharing the
+                x-axis ("shared_x"), a single 3D axis or a single polar
+                axis.
+            style:
+                The name of the seaborn style the figure is drawn in, e.g.
+                "white". Figures are only reused within the same style.
+
+        Returns:
+            A (figure, axes) tuple, like `plt.subplots()`. For "twin" and
+            "shared_x" the axes are a tuple of both.
+        """
+
+        key = (layout, style)
+        figure = self._spare.pop(key, None)
+
+        if figure is None:
+            figure = figure_class()(figsize=LAYOUT_SIZES.get(layout,
+                                                             FIGURE_SIZE))
+        else:
+            self.recycle(figure)
+
+        self._in_use[figure] = key
+
+        return figure, self.add_axes(figure, layout)
+
+    def give_back(self, figure) -> None:
+        """Returns a figure to the pool once it has been saved. Figures
+        the pool did not hand out, or that it already has a spare for,
+        are released instead."""
+
+        key = self._in_use.pop(figure, None)
+
+        if key is not None and key not in self._spare:
+            self._spare[key] = figure
+        elif figure.canvas.manager is not None:
+            # Made through pyplot, which holds on to it.
+            pyplot().close(figure)
+        else:
+            figure.clear()
+
+    def clear(self) -> None:
+        """Releases every spare figure."""
+
+        for figure in self._spare.values():
+            figure.clear()
+
+        self._spare.clear()
+
+    @staticmethod
+    def add_axes(figure, layout):
+        """Gives an empty figure the axes of the given layout."""
+
+        match layout:
+            case "single":
+                return figure.subplots()
+            case "twin":
+                axis = figure.subplots()
+                return axis, axis.twinx()
+            case "shared_x":
+                return tuple(figure.subplots(2, sharex=True))
+            case "3d":
+                return figure.add_subplot(projection="3d")
+            case "polar":
+                return figure.add_subplot(polar=True)
+
+        raise ValueError(f"Unknown figure layout {layout}")
+
+    @staticmethod
+    def recycle(figure) -> None:
+        """Clears a spare figure so it can be drawn on as if it were new."""
+
+        from matplotlib import rcParams
+
+        figure.clear()
+
+        # tight_layout() moves the subplots.
+        figure.subplots_adjust(**{
+            name: rcParams[f"figure.subplot.{name}"]
+            for name in ("left", "right", "bottom", "top", "wspace", "hspace")
+        })
+
+
+FIGURE_POOL = FigurePool()
+
 
 class DataPlotter(ABC):
     """Models common styling parameters and saving functionality for some
@@ -72,7 +432,8 @@ class DataPlotter(ABC):
     """
 
     @staticmethod
-    def get_plotter(plot_type: str, data_frame: pd.DataFrame, out_dir: str):
+    def get_plotter(plot_type: str, data_frame: "pd.DataFrame", out_dir: str,
+                    **output_options):
         """Return correct `DataPlotter` instance.
 
         Instantiates the correct `DataPlotter` subclass based on the given
@@ -88,6 +449,14 @@ class DataPlotter(ABC):
                 Where the `DataPlotter` subclass should
                 save the generated plot when the `.save()`
                 method is invoked.
+            output_options:
+                Optional `file_format`, `dpi_quality`, `compression`
+                and `quality` to save the plot with. See `.__init__()`.
+                The per-sample sections also take `max_samples`,
+                `sample_summary`, `cluster_samples`, `page` and
+                `page_set`. See
+                `PerSamplePlotter.__init__()`. Sections with more than
+                one set also take `sets`.
 
         Returns:
             The correct `DataPlotter` instance.
@@ -101,36 +470,43 @@ class DataPlotter(ABC):
         # This statement requires use of latest python version.
         match plot_type:
             case "st":
-                return SubstitutionPlotter(*args)
+                return SubstitutionPlotter(*args, **output_options)
             case "dp":
-                return DepthDistributionPlotter(*args)
+                return DepthDistributionPlotter(*args, **output_options)
             case "hwe":
-                return HWEPlotter(*args)
+                return HWEPlotter(*args, **output_options)
             case "idd":
-                return IndelDistributionPlotter(*args)
+                return IndelDistributionPlotter(*args, **output_options)
             case "qual":
-                return QualPlotter(*args)
+                return QualPlotter(*args, **output_options)
             case "psi":
-                return PerSampleIndelsPlotter(*args)
+                return PerSampleIndelsPlotter(*args, **output_options)
             case "af":
-                return AlleleFrequencyPlotter(*args)
+                return AlleleFrequencyPlotter(*args, **output_options)
             case "psc":
-                return PerSampleCountsPlotter(*args)
+                return PerSampleCountsPlotter(*args, **output_options)
             case "tstv":
-                return TsTvsPlotter(*args)
+                return TsTvsPlotter(*args, **output_options)
             case "sis":
-                return SingletonStatsPlotter(*args)
+                return SingletonStatsPlotter(*args, **output_options)
             case "sn":
-                return SummaryPlotter(*args)
+                return SummaryPlotter(*args, **output_options)
 
     def __init__(self, data, out_dir_base, image_type, file_format="tiff",
-                 dpi_quality=400) -> None:
+                 dpi_quality=400, compression=None, quality=None,
+                 sets=None) -> None:
         """Initialises an instance.
 
         Initialises a DataPlotter's data (pd.DataFrame), title, image quality,
         file_format and location. Also sets up some common member variables
         all of this class' subclasses can inherit to produce visually similar
         plots where this is desired.
+
+        `compression` (0-9) only applies to PNG and `quality` (1-100) only
+        to JPEG and WebP. Either is left to Pillow's default when `None`.
+
+        `sets` is the data split by set, keyed by id, when the section has
+        more than one. See `Section.get_sets()` and `.plot_sets()`.
         """
         # Set the main member variables.
         self._figure = None
@@ -139,6 +515,18 @@ class DataPlotter(ABC):
         self._type = image_type
         self._file_format = file_format
         self._dpi_quality = dpi_quality
+        self._compression = compression
+        self._quality = quality
+
+        # The sets of the data, and while they are drawn, the id of the set
+        # being drawn and the figure they share. See `.plot_sets()`.
+        self._sets = sets
+        self._set_id = None
+        self._set_figure = None
+        self._set_panels = None
+
+        # (path, seconds, bytes) of the last `.save()`.
+        self._save_report = None
 
         # Common styling parameters for *all* subclasses,
         # of course these can be overriden, but is nice for all
@@ -163,6 +551,107 @@ class DataPlotter(ABC):
         """Plots the figure according to the subclass' own rules and saves
         it as a member variable: `_figure`."""
 
+    def plot_sets(self):
+        """Plots the figure, drawing each set of the data side by side if
+        there is more than one.
+
+        Each set is drawn by the subclass' own `.plot()`, with `_data` set
+        to the rows of that set, on a subfigure of one wide figure (see
+        `.take_figure()`), so the sets share one image and axes of the
+        same size. A section with a single set is simply plotted.
+
+        Returns
+            `self`:
+                For method chaining.
+        """
+
+        if not self._sets or len(self._sets) < 2:
+            return self.plot()
+
+        data = self._data
+        try:
+            for self._set_id, self._data in self._sets.items():
+                self.plot()
+        finally:
+            self._data = data
+            self._set_id = None
+
+        self._figure, self._set_figure = self._set_figure, None
+        self._set_panels = None
+
+        return self
+
+    def take_figure(self, layout="single", style=None):
+        """Returns a figure and its axes to plot on, reusing the figure of
+        an earlier plot where possible. See `FigurePool.take()`.
+
+        While the sets of the data are drawn (see `.plot_sets()`), returns
+        the next subfigure of their shared figure instead, labelled with
+        the id of its set."""
+
+        if self._set_id is None:
+            return FIGURE_POOL.take(layout, style)
+
+        if self._set_figure is None:
+            width, height = LAYOUT_SIZES.get(layout, FIGURE_SIZE)
+            self._set_figure = figure_class()(
+                figsize=(width * len(self._sets), height),
+                layout="constrained")
+            self._set_panels = iter(
+                self._set_figure.subfigures(1, len(self._sets)))
+
+        subfigure = next(self._set_panels)
+        subfigure.supxlabel(f"Set {self._set_id}", **self._font)
+
+        return subfigure, FIGURE_POOL.add_axes(subfigure, layout)
+
+    def tight_layout(self, figure) -> None:
+        """Tightens the layout of a figure. The subfigures of sets drawn
+        side by side are laid out by their shared figure instead."""
+
+        if self._set_id is None:
+            figure.tight_layout()
+
+    def draw_bars(self, axis, labels, heights, width=0.8, **bar_options):
+        """Draws a bar chart of values that are already known straight
+        onto an axis.
+
+        Looks the same as `sns.barplot` with this plotter's palette, but
+        skips seaborn's grouping and estimating, which is most of its cost
+        when every bar is a single number. The colours come from
+        `bar_colours`, which does not need seaborn; seaborn is only loaded
+        here if the caller draws inside a seaborn style, as all current
+        callers do.
+
+        Args:
+            axis:
+                The axis to draw on.
+            labels:
+                The tick label of each bar.
+            heights:
+                The height of each bar.
+            width:
+                The width of each bar, as a fraction of the gap between them.
+            bar_options:
+                Any other arguments for `axis.bar`, e.g. `alpha`.
+
+        Returns:
+            The `BarContainer` of the bars, e.g. for `axis.bar_label`.
+        """
+
+        positions = np.arange(len(labels))
+
+        bars = axis.bar(positions, heights, width=width,
+                        color=bar_colours(self._pallete, len(labels)),
+                        **bar_options)
+
+        # Set up the x-axis as seaborn does for categories.
+        axis.set_xticks(positions, labels)
+        axis.xaxis.grid(False)
+        axis.set_xlim(-0.5, len(labels) - 0.5)
+
+        return bars
+
     def save(self) -> None:
         """Saves this instance's figure to disk.
 
@@ -172,17 +661,52 @@ class DataPlotter(ABC):
         Tries to save this plot to disk in the given output folder. This folder
         will be created if it does not exist. If it cannot be created, the program
         will error and exit.
+
+        Once saved, the figure is handed back to `FIGURE_POOL` (or closed),
+        so it cannot be saved again.
         """
         # self._figure will be None if the plotter subclass did not finish its
         # execution (construction of the graph).
         if self._figure is not None:
             fig = self._figure.get_figure()
-            fig.savefig(
-                f"{self._out_dir_base}/{self._type}/{self._type}.{self._file_format}", dpi=self._dpi_quality)
+            path = f"{self._out_dir_base}/{self._type}/{self.file_name()}"
+
+            try:
+                start = time.perf_counter()
+                fig.savefig(path, dpi=self._dpi_quality,
+                            **self._encoder_options())
+                seconds = time.perf_counter() - start
+            finally:
+                FIGURE_POOL.give_back(fig)
+                self._figure = None
+
+            self._save_report = (path, seconds, os.path.getsize(path))
         else:
             warn(True,
                  f"Could not generate {self._type} plot. Bad data? Please check input")
 
+    def file_name(self) -> str:
+        """The name of the file `.save()` writes, e.g. "st.tiff"."""
+
+        return f"{self._type}.{self._file_format}"
+
+    def _encoder_options(self) -> dict:
+        """Extra `savefig` arguments for this instance's file format."""
+
+        pil_kwargs = {}
+        if self._file_format == "png" and self._compression is not None:
+            pil_kwargs["compress_level"] = self._compression
+        if self._file_format in ("jpeg", "webp") and self._quality is not None:
+            pil_kwargs["quality"] = self._quality
+
+        return {"pil_kwargs": pil_kwargs} if pil_kwargs else {}
+
+    def get_save_report(self):
+        """Accessor for the (path, encode seconds, file size in bytes) of
+        the last saved figure. `None` if nothing has been saved."""
+
+        return self._save_report
+
 
 class SubstitutionPlotter(DataPlotter):
     """Produces a plot to show frequency of substitution types."""
@@ -256,25 +780,25 @@ class SubstitutionPlotter(DataPlotter):
         node_angles = np.array(list(first) + list(second))
 
         # Produce the plot.
-        fig, _ = plot_connectivity_circle(
+        figure, axis = self.take_figure("polar")
+        draw_chord_circle(
+            axis,
             data,
             names,
+            node_angles,
+            # Group the purine / pyrmidine pairs.
+            ["Orange", "Orange", "Purple", "Purple"] * 2,
             textcolor="black",
             # The stronger the shade of Red - the more frequent the
             # substitution type.
             colormap="Reds",
-            facecolor="White",
-            node_angles=node_angles,
-            # Group the purine / pyrmidine pairs.
-            node_colors=["Orange", "Orange", "Purple", "Purple"] * 2,
             linewidth=4,
             title="Chord Plot to Show Frequency of Nucleobase\nSubstitution Types. Read from Left to Right. \n\n Colour is Relationship Strength\n(Frequency of Substitution Type)",
             fontsize_names=12,
             node_edgecolor="White",
-            show=False
         )
 
-        self._figure = fig
+        self._figure = figure
         return self
 
 
@@ -294,11 +818,13 @@ class DepthDistributionPlotter(DataPlotter):
                 For method chaining.
         """
 
+        sns = seaborn()
+
         # Use a seaborn theme, just for this plot.
         # Closes the resources after execution
         # so other plots are not affected.
         with sns.axes_style("white"):
-            figure, axis = plt.subplots()
+            figure, (axis, second_axis) = self.take_figure("twin", "white")
 
             # Clean data into form that is workable.
             num_to_take = 100
@@ -318,14 +844,13 @@ class DepthDistributionPlotter(DataPlotter):
             axis.set_xlabel("Bin", fontdict=self._font)
 
             # Plot second data set.
-            second_axis = axis.twinx()
             sns.lineplot(ax=second_axis,
                          y=cum_sum, x=np.arange(num_to_take), color="orange", markers=True)
             second_axis.set_ylabel("Cumulative Proportion of Genotypes (%)",
                                    fontdict=self._font, color="orange")
 
             # Remove spines for aesthetic reasons.
-            sns.despine()
+            sns.despine(figure)
 
         self._figure = figure
         return self
@@ -348,8 +873,10 @@ class HWEPlotter(DataPlotter):
                 For method chaining.
         """
 
+        sns = seaborn()
+
         with sns.axes_style("white"):
-            figure, axis = plt.subplots()
+            figure, axis = self.take_figure("single", "white")
 
             # Calculcate the HWE curve.
             y1 = np.array(self._data["1st alt allele frequency"])
@@ -410,7 +937,7 @@ class IndelDistributionPlotter(DataPlotter):
                 For method chaining.
         """
 
-        figure, axis = plt.subplots()
+        figure, axis = self.take_figure()
 
         # Plot the bar chart, aligning the bars centrally to give the
         # appearance of a histogram.
@@ -447,8 +974,10 @@ class QualPlotter(DataPlotter):
                 For method chaining.
         """
 
+        sns = seaborn()
+
         with sns.axes_style("whitegrid"):
-            figure, axis = plt.subplots()
+            figure, axis = self.take_figure("single", "whitegrid")
 
             # Plot the two, and colour the scatter dots in proportion
             # to each data point's quality. Stronger shades of
@@ -499,9 +1028,11 @@ class SingletonStatsPlotter(DataPlotter):
                 For method chaining.
         """
 
+        sns = seaborn()
+
         # Use a different background here. Got bored.
         with sns.axes_style("darkgrid"):
-            figure, axis = plt.subplots()
+            figure, axis = self.take_figure("single", "darkgrid")
 
             # Filter out only the columns from the DataFrame that are needed
             # for this plot.
@@ -514,20 +1045,10 @@ class SingletonStatsPlotter(DataPlotter):
                 self._data.loc[self._data.index[0]][name] for name in x_labels
             ]
 
-            # Use for positioning the bars. Rename them later...
-            x_ticks = np.arange(len(x_labels))
-            sns.barplot(
-                ax=axis,
-                x=x_ticks,
-                y=y_values,
-                width=0.4,
-                alpha=0.7,
-                palette=self._pallete
-            )
+            self.draw_bars(axis, x_labels, y_values, width=0.4, alpha=0.7)
 
-            # Set the figure title, axis labels and the names for the bars.
+            # Set the figure title and axis labels.
             axis.set_title("Singleton Stats", fontdict=self._font)
-            axis.set_xticks(x_ticks, x_labels)
             axis.set_ylabel("Value", fontdict=self._font)
             axis.set_xlabel("Statistic", fontdict=self._font)
 
@@ -552,11 +1073,11 @@ class AlleleFrequencyPlotter(DataPlotter):
                 For method chaining.
         """
 
-        with sns.axes_style("whitegrid"):
-            figure = plt.figure()
+        sns = seaborn()
 
+        with sns.axes_style("whitegrid"):
             # Use a 3d projection here.
-            axis = figure.add_subplot(projection="3d")
+            figure, axis = self.take_figure("3d", "whitegrid")
 
             # Plot x, y, and z on to the axis.
             axis.scatter(self._data["number of transitions"],
@@ -590,9 +1111,11 @@ class TsTvsPlotter(DataPlotter):
                 For method chaining.
         """
 
+        sns = seaborn()
+
         with sns.axes_style("whitegrid"):
 
-            figure, axis = plt.subplots()
+            figure, axis = self.take_figure("single", "whitegrid")
 
             # Grab the columns.
             # We're only expecting one row due to
@@ -601,13 +1124,8 @@ class TsTvsPlotter(DataPlotter):
             second_column = self._data["tv"][0]
 
             # Plot the bar chart.
-            sns.barplot(
-                ax=axis,
-                x=["Transitions", "Transversions"],
-                y=[first_column, second_column],
-                width=0.3,
-                palette=self._pallete
-            )
+            self.draw_bars(axis, ["Transitions", "Transversions"],
+                           [first_column, second_column], width=0.3)
 
             # Now set the titles and axis labels.
             # Professional.
@@ -621,12 +1139,246 @@ class TsTvsPlotter(DataPlotter):
             return self
 
 
-class PerSampleCountsPlotter(DataPlotter):
+class PerSamplePlotter(DataPlotter):
+    """Models a plot of a section with one row per sample (PSC and PSI).
+
+    Up to `max_samples` samples, every sample gets its own bars. Past
+    that, a bar per sample is unreadable and slow to draw, so the section
+    is summarised instead, drawing the same number of artists however
+    many samples there are:
+
+    - "heatmap": every sample's (scaled) statistics as one image.
+    - "quantile": the spread of each statistic across all samples.
+    - "binned": the mean and spread of each statistic over bins of
+      consecutive samples.
+
+    The quantile and binned summaries also name the most unusual samples
+    of each statistic. See `sample_summary`.
+
+    Alternatively, a section can be split into pages of a few samples
+    each (see `Section.get_pages()`), each plotted sample by sample by its
+    own plotter and saved as its own image. See `page_file_name()`.
+    """
+
+    # The summary drawn when none is asked for.
+    DEFAULT_SUMMARY = "quantile"
+
+    def __init__(self, *args, max_samples=DEFAULT_MAX_SAMPLES,
+                 sample_summary=None, cluster_samples=False, page=None,
+                 page_set=None, **output_options) -> None:
+        """See `DataPlotter.__init__()`.
+
+        Sections with more than `max_samples` samples are drawn as the
+        `sample_summary` ("heatmap", "quantile" or "binned") of their
+        samples, or this class' `DEFAULT_SUMMARY` if that is `None`. The
+        samples of a heatmap are put in input order, or with similar
+        samples side by side if `cluster_samples` is set.
+
+        If `page` (a number, from 1) is given, the data is one page of the
+        section, which is always plotted sample by sample. `page_set` is
+        the id of the set the page is of, if the section has more than one.
+        """
+
+        super().__init__(*args, **output_options)
+        self._max_samples = max_samples
+        self._sample_summary = sample_summary or self.DEFAULT_SUMMARY
+        self._cluster_samples = cluster_samples
+        self._page = page
+        self._page_set = page_set
+
+    def plot(self):
+        """Plots every sample, or a summary of them if there are too many.
+
+        Returns
+            `self`:
+                For method chaining.
+        """
+
+        if self._page is None and len(self._data) > self._max_samples:
+            return self.plot_summary()
+
+        return self.plot_samples()
+
+    def file_name(self) -> str:
+        """See `DataPlotter.file_name()` and `page_file_name()`."""
+
+        if self._page is None:
+            return super().file_name()
+
+        return page_file_name(self._type, self._page, self._file_format)
+
+    def page_title(self, title) -> str:
+        """The title of the per-sample plot, with the page (and its set),
+        if any."""
+
+        if self._page is None:
+            return title
+
+        if self._page_set is not None:
+            return f"{title}, Set {self._page_set}, Page {self._page}"
+
+        return f"{title}, Page {self._page}"
+
+    @abstractmethod
+    def plot_samples(self):
+        """Plots the section with bars for every sample."""
+
+    @abstractmethod
+    def plot_summary(self):
+        """Plots a summary of the section's samples."""
+
+    def draw_heatmap(self, axis, statistics):
+        """Draws the statistics of every sample as one image, a row per
+        statistic and a column per sample.
+
+        Each statistic is scaled to between 0 and 1 on its own (see
+        `scale_columns()`). Past `HEATMAP_COLUMNS` samples (or one per
+        pixel), neighbouring samples are averaged, so the image stays a
+        bounded size.
+
+        Args:
+            axis:
+                The axis to draw on.
+            statistics:
+                The columns to draw.
+
+        Returns:
+            The `AxesImage`, e.g. for a colour bar.
+        """
+
+        values = scale_columns(self._data[list(statistics)].to_numpy(dtype=float))
+        if self._cluster_samples:
+            values = values[cluster_order(values)]
+
+        # No more columns than the axis is wide in pixels, so the image need
+        # not be resampled, which would blur the rows into each other.
+        width = axis.bbox.width / axis.figure.dpi * self._dpi_quality
+        _, columns, _ = binned_summary(values,
+                                       min(HEATMAP_COLUMNS, int(width)))
+
+        image = axis.imshow(
+            columns.T,
+            aspect="auto",
+            interpolation="nearest",
+            cmap=self._pallete,
+            vmin=0,
+            vmax=1,
+            extent=(0, len(values), len(statistics) - 0.5, -0.5)
+        )
+
+        axis.set_yticks(np.arange(len(statistics)), statistics)
+        axis.grid(False)
+
+        return image
+
+    def heatmap_label(self) -> str:
+        """The x-axis label of a heatmap of this plotter's samples."""
+
+        if self._cluster_samples:
+            return "Sample (similar samples together)"
+
+        return "Sample (in input order)"
+
+    def draw_quantiles(self, axis, statistics) -> None:
+        """Draws the spread of each statistic across all samples, one
+        statistic per row: a line from the lowest to the highest value, a
+        thin bar over the middle 90% of samples, a thick bar over the
+        middle 50% and a tick at the median.
+
+        Args:
+            axis:
+                The axis to draw on.
+            statistics:
+                The columns to summarise.
+        """
+
+        values = self._data[list(statistics)].to_numpy(dtype=float)
+        lowest, low, lower, median, upper, high, highest = \
+            quantile_summary(values)
+
+        positions = np.arange(len(statistics))
+        colours = bar_colours(self._pallete, len(statistics))
+
+        axis.hlines(positions, lowest, highest, colors=colours, linewidth=1)
+        axis.barh(positions, high - low, left=low, height=0.3,
+                  color=colours, alpha=0.5)
+        axis.barh(positions, upper - lower, left=lower, height=0.6,
+                  color=colours)
+        axis.vlines(median, positions - 0.3, positions + 0.3,
+                    colors="black", linewidth=2)
+
+        indices, scores = top_outliers(values)
+        columns = np.broadcast_to(positions, indices.shape)
+        self._name_outliers(axis, indices, scores,
+                            values[indices, columns], columns)
+
+        # First statistic at the top, as in the per-sample plot.
+        axis.set_yticks(positions, statistics)
+        axis.yaxis.grid(False)
+        axis.set_ylim(len(statistics) - 0.5, -0.5)
+
+    def draw_bins(self, axis, statistics) -> None:
+        """Draws the mean of each statistic over bins of consecutive
+        samples as a line, in a band one standard deviation either side.
+
+        Args:
+            axis:
+                The axis to draw on.
+            statistics:
+                The columns to summarise. Each line is labelled with its
+                column, for a legend.
+        """
+
+        values = self._data[list(statistics)].to_numpy(dtype=float)
+        starts, means, deviations = binned_summary(values)
+        middles = (starts + np.append(starts[1:], len(values)) - 1) / 2
+
+        colours = bar_colours(self._pallete, len(statistics))
+        for column, (statistic, colour) in enumerate(zip(statistics, colours)):
+            axis.fill_between(middles,
+                              means[:, column] - deviations[:, column],
+                              means[:, column] + deviations[:, column],
+                              color=colour, alpha=0.25, linewidth=0)
+            axis.plot(middles, means[:, column], color=colour,
+                      label=statistic)
+
+        indices, scores = top_outliers(values)
+        columns = np.broadcast_to(np.arange(len(statistics)), indices.shape)
+        self._name_outliers(axis, indices, scores,
+                            indices, values[indices, columns])
+
+        axis.set_xlim(0, len(values) - 1)
+
+    def _name_outliers(self, axis, indices, scores, x, y) -> None:
+        """Marks and names the samples found by `top_outliers()` that
+        really are outliers, at the given positions."""
+
+        outliers = scores > OUTLIER_SCORE
+        names = self._data["sample"].to_numpy()[indices[outliers]]
+
+        # Stack the names of a statistic's outliers by rank, so samples
+        # with the same value do not hide each other.
+        ranks = np.broadcast_to(np.arange(len(indices))[:, np.newaxis],
+                                indices.shape)[outliers]
+
+        axis.scatter(x[outliers], y[outliers], marker="D", s=20,
+                     color="black", zorder=3)
+        for name, name_x, name_y, rank in zip(names, x[outliers],
+                                              y[outliers], ranks):
+            axis.annotate(name, (name_x, name_y), xytext=(4, 4 + 12 * rank),
+                          textcoords="offset points",
+                          fontsize=self._annotation_text_size - 2)
+
+
+class PerSampleCountsPlotter(PerSamplePlotter):
     """Implements the methods required to produce a plot for the PSC section
     of the input .vchk file.
     """
 
-    def plot(self):
+    # Ten or so statistics per sample make a readable heatmap.
+    DEFAULT_SUMMARY = "heatmap"
+
+    def plot_samples(self):
         """Interesting grouped horizontal bar chart that shows
         the value of each statistic (frequency/count) per sample.
         The same statistic across each sample are coloured the same.
@@ -639,9 +1391,11 @@ class PerSampleCountsPlotter(DataPlotter):
                 For method chaining.
         """
 
+        sns = seaborn()
+
         # Back to black.
         with sns.axes_style("darkgrid"):
-            figure, axis = plt.subplots()
+            figure, axis = self.take_figure("single", "darkgrid")
 
             # Use Pands drop and melt methods to transform data into format
             # needed for this type of plot.
@@ -666,7 +1420,7 @@ class PerSampleCountsPlotter(DataPlotter):
             # Format titles, labels and gridlines.
             axis.grid(visible=True, axis="y", alpha=0.3)
             axis.set_title(
-                "Counts per Stat per Sample",
+                self.page_title("Counts per Stat per Sample"),
                 fontdict=self._font,
                 y=self._title_pos[1],
                 fontsize=30
@@ -682,24 +1436,72 @@ class PerSampleCountsPlotter(DataPlotter):
             for container in axis.containers:
                 axis.bar_label(container, fmt="%.1d")
 
-            # Move the legend and tighten the layout.
-            sns.move_legend(
-                axis,
-                "upper left",
-                bbox_to_anchor=self._default_legend_position
+            # Move the legend and tighten the layout. Moved in place, as
+            # `sns.move_legend()` leaves the old legend (and so the whole
+            # figure) in a cache in matplotlib that is never emptied.
+            legend = axis.get_legend()
+            legend.set_loc("upper left")
+            legend.set_bbox_to_anchor(self._default_legend_position)
+            self.tight_layout(figure)
+
+            self._figure = figure
+            return self
+
+    def plot_summary(self):
+        """Summary of the counts of each statistic across all the
+        samples. See `PerSamplePlotter`.
+
+        Returns
+            `self`:
+                For method chaining.
+        """
+
+        sns = seaborn()
+
+        statistics = self._data.columns.drop(["id", "sample", "average depth"])
+
+        with sns.axes_style("darkgrid"):
+            figure, axis = self.take_figure("single", "darkgrid")
+
+            match self._sample_summary:
+                case "heatmap":
+                    image = self.draw_heatmap(axis, statistics)
+                    figure.colorbar(image, ax=axis,
+                                    label="Count (scaled per stat)")
+                    axis.set_xlabel(self.heatmap_label(), fontdict=self._font)
+                    axis.set_ylabel("Stat", fontdict=self._font)
+                case "binned":
+                    self.draw_bins(axis, statistics)
+                    axis.set_xlabel("Sample (in input order)",
+                                    fontdict=self._font)
+                    axis.set_ylabel("Value (Count)", fontdict=self._font)
+                    axis.legend(loc="upper left",
+                                bbox_to_anchor=self._default_legend_position)
+                case _:
+                    self.draw_quantiles(axis, statistics)
+                    axis.set_xlabel("Value (Count)", fontdict=self._font)
+                    axis.set_ylabel("Stat", fontdict=self._font)
+
+            axis.set_title(
+                f"Counts per Stat across {len(self._data)} Samples",
+                fontdict=self._font,
+                y=self._title_pos[1],
+                fontsize=30
             )
-            figure.tight_layout()
+
+            sns.despine(figure)
+            self.tight_layout(figure)
 
             self._figure = figure
             return self
 
 
-class PerSampleIndelsPlotter(DataPlotter):
+class PerSampleIndelsPlotter(PerSamplePlotter):
     """Implements the methods required to produce a plot for the PSI section
     of the input .vchk file.
     """
 
-    def plot(self):
+    def plot_samples(self):
         """Plots two bar charts on one figure sharing a common
         x-axis so that sample names aren't unnecessarily
         repeated.
@@ -712,13 +1514,15 @@ class PerSampleIndelsPlotter(DataPlotter):
                 For method chaining.
         """
 
+        sns = seaborn()
+
         with sns.axes_style("whitegrid"):
-            figure, (axis1, axis2) = plt.subplots(2, sharex=True)
+            figure, (axis1, axis2) = self.take_figure("shared_x", "whitegrid")
 
             # Set the title for the overall figure rather than
             # just the axis this time
-            figure.suptitle("Plot to show Num Hets by Sample",
-                            fontdict=self._font)
+            figure.suptitle(self.page_title("Plot to show Num Hets by Sample"),
+                            **self._font)
 
             # Plot the two bar charts onto the correct respective axes.
             width = 0.3
@@ -753,6 +1557,44 @@ class PerSampleIndelsPlotter(DataPlotter):
             self._figure = figure
             return self
 
+    def plot_summary(self):
+        """Summary of nhets (top) and naa (bottom) across all the
+        samples. See `PerSamplePlotter`.
+
+        Returns
+            `self`:
+                For method chaining.
+        """
+
+        sns = seaborn()
+
+        with sns.axes_style("whitegrid"):
+            figure, (axis1, axis2) = self.take_figure("shared_x", "whitegrid")
+
+            figure.suptitle(f"Num Hets across {len(self._data)} Samples",
+                            **self._font)
+
+            match self._sample_summary:
+                case "heatmap":
+                    for axis, statistic in ((axis1, "nhets"), (axis2, "naa")):
+                        image = self.draw_heatmap(axis, [statistic])
+                        figure.colorbar(image, ax=axis, label="Scaled count")
+                    axis2.set_xlabel(self.heatmap_label(), fontdict=self._font)
+                case "binned":
+                    self.draw_bins(axis1, ["nhets"])
+                    self.draw_bins(axis2, ["naa"])
+                    axis2.set_xlabel("Sample (in input order)",
+                                     fontdict=self._font)
+                    axis1.set_ylabel("Num Hets", fontdict=self._font)
+                    axis2.set_ylabel("Num AA", fontdict=self._font)
+                case _:
+                    self.draw_quantiles(axis1, ["nhets"])
+                    self.draw_quantiles(axis2, ["naa"])
+                    axis2.set_xlabel("Value (Count)", fontdict=self._font)
+
+            self._figure = figure
+            return self
+
 
 class SummaryPlotter(DataPlotter):
     """Implements the methods required to produce a plot for the Summary 
@@ -766,7 +1608,9 @@ class SummaryPlotter(DataPlotter):
             `self`:
                 For method chaining.
         """
-        figure, axis = plt.subplots()
+
+        sns = seaborn()
+        figure, axis = self.take_figure()
 
         with sns.axes_style("white"):
 
@@ -778,20 +1622,18 @@ class SummaryPlotter(DataPlotter):
             # their relative scale to the other numbers
             # will distort the bar chart :(
             self._data.drop([0, 8], inplace=True)
-            bar = sns.barplot(ax=axis, data=self._data, x="key", y="value",
-                              palette=self._pallete)
 
             labels = list(self._data["key"])
             cleaned = [label.split("number of ")[1].strip().replace(
                 ":", "") for label in labels]
 
-            bar.set_xticklabels(cleaned)
+            bars = self.draw_bars(axis, cleaned, self._data["value"])
 
-            bar.set_xlabel("Key", fontdict=self._font)
-            bar.set_ylabel("Value (Count)", fontdict=self._font)
-            bar.bar_label(bar.containers[0])
+            axis.set_xlabel("Key", fontdict=self._font)
+            axis.set_ylabel("Value (Count)", fontdict=self._font)
+            axis.bar_label(bars)
 
-            sns.despine()
+            sns.despine(figure)
 
             axis.set_title(
                 f"Summary Numbers.\nNum Samples = {num_samples}\nMulti-Allelic SNP = {multi_allelic_snp}", fontdict=self._font)
@@ -0,0 +1,317 @@
+# MIT License
+
+# Copyright (c) 2022 Ben.Thornton955@cranfield.ac.uk (ben.thornton@astrazeneca.com)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Per-phase timing and memory instrumentation.
+
+The parser and plotters wrap each phase of a run (parsing the file,
+parsing a section, plotting, saving ...) in `phase()`. When profiling is
+switched on, each phase records its wall time, CPU time, the resident
+memory of the process when it started and ended, and the peak resident
+memory of the process so far. When it is off, `phase()` does nothing, so
+it is cheap enough to leave in place.
+
+Records can be printed to stderr, written as JSON, written as a Chrome
+trace-event file (one nested span per phase, viewable in Perfetto or
+chrome://tracing), or passed to any number of hooks as each phase finishes.
+
+Typical usage example:
+
+    PROFILER.enable()
+    with phase("plot", section="psc") as record:
+        ...
+        record.attributes["rows"] = 100
+    PROFILER.report()
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+
+from typing import Callable, List
+
+from .utils import info
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows.
+    resource = None
+
+
+def peak_rss_mb() -> float:
+    """Returns the peak resident memory of this process so far, in MB."""
+
+    if resource is None:
+        return 0.0
+
+    # Kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def current_rss_mb() -> float:
+    """Returns the resident memory of this process right now, in MB.
+
+    Only known on Linux. Elsewhere, returns the peak so far instead.
+    """
+
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return peak_rss_mb()
+
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class PhaseRecord:
+    """The measurements of a single phase.
+
+      Attributes:
+          name: The name of the phase. E.g. "save".
+          section: The section the phase belongs to, if any. E.g. "psc".
+          start: The wall-clock time the phase started at (seconds since epoch).
+          wall: The wall time the phase took, in seconds.
+          cpu: The CPU time the process spent in the phase, in seconds.
+          rss_start_mb: The resident memory of the process when the phase
+              started, in MB.
+          rss_end_mb: The resident memory of the process when the phase
+              ended, in MB.
+          process_peak_rss_mb: The peak resident memory of the process from
+              its start to the end of the phase, in MB. Not the phase's own
+              peak: every phase after the largest one has the same value.
+          depth: How many phases this phase is nested in.
+          pid: The process the phase ran in.
+          thread: The thread the phase ran in.
+          attributes: Any extra details about the phase. E.g. the row count.
+      """
+
+    def __init__(self, name, section=None, depth=0, **attributes) -> None:
+        """Initialises a record for a phase that is about to start."""
+
+        self.name = name
+        self.section = section
+        self.start = time.time()
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.rss_start_mb = 0.0
+        self.rss_end_mb = 0.0
+        self.process_peak_rss_mb = 0.0
+        self.depth = depth
+        self.pid = os.getpid()
+        self.thread = threading.get_ident()
+        self.attributes = attributes
+
+    def to_dict(self) -> dict:
+        """Returns this record as a JSON-serialisable dict."""
+        return dict(self.__dict__)
+
+
+class Profiler:
+    """Collects a `PhaseRecord` for each phase while it is enabled.
+
+      Attributes:
+          _enabled: Whether phases are being recorded.
+          _records: The records of the finished phases, in the order they
+              finished.
+          _hooks: Functions called with each record as its phase finishes.
+          _depth: How many phases are currently open (per thread).
+      """
+
+    def __init__(self) -> None:
+        """Initialises a disabled profiler."""
+
+        self._enabled = False
+        self._records = []
+        self._hooks = []
+        self._depth = threading.local()
+
+    def enable(self) -> None:
+        """Start recording phases."""
+        self._enabled = True
+
+    def disable(self) -> None:
+        """Stop recording phases."""
+        self._enabled = False
+
+    def is_enabled(self) -> bool:
+        """Whether phases are being recorded."""
+        return self._enabled
+
+    def add_hook(self, hook: Callable[[PhaseRecord], None]) -> None:
+        """Registers a function to call with each finished `PhaseRecord`.
+
+          Adding a hook enables the profiler.
+          """
+
+        self._hooks.append(hook)
+        self.enable()
+
+    def phase(self, name, section=None, **attributes):
+        """Measures the phase run inside this context manager.
+
+          Args:
+              name:
+                  The name of the phase. E.g. "parse".
+              section:
+                  The section the phase belongs to, if any.
+              attributes:
+                  Extra details to record. More can be added to the
+                  yielded record's `attributes` before the phase ends.
+
+          Returns:
+              A context manager yielding the `PhaseRecord`, or `None` if
+              the profiler is disabled.
+          """
+
+        if not self._enabled:
+            return contextlib.nullcontext()
+
+        return self._measure(name, section, attributes)
+
+    @contextlib.contextmanager
+    def _measure(self, name, section, attributes):
+        """Does the measuring for `.phase()`."""
+
+        depth = getattr(self._depth, "value", 0)
+        self._depth.value = depth + 1
+
+        record = PhaseRecord(name, section, depth, **attributes)
+        record.rss_start_mb = current_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+
+        try:
+            yield record
+        finally:
+            record.wall = time.perf_counter() - wall_start
+            record.cpu = time.process_time() - cpu_start
+            record.rss_end_mb = current_rss_mb()
+            # The kernel only updates the peak now and then, so it can be
+            # behind the current RSS.
+            record.process_peak_rss_mb = max(peak_rss_mb(), record.rss_end_mb)
+            self._depth.value = depth
+
+            self.add_records([record])
+
+    def add_records(self, records) -> None:
+        """Adds finished records, e.g. ones sent back by a worker process,
+        and passes each to the hooks."""
+
+        for record in records:
+            self._records.append(record)
+            for hook in self._hooks:
+                hook(record)
+
+    def take_records(self) -> List[PhaseRecord]:
+        """Returns the finished records and forgets them."""
+
+        records, self._records = self._records, []
+        return records
+
+    def get_records(self) -> List[PhaseRecord]:
+        """Accessor for the finished records."""
+        return self._records
+
+    def report(self) -> None:
+        """Prints a table of the finished phases to stderr, per process in
+        the order they started.
+
+        "RSS +/- (MB)" is how much the resident memory of the process grew
+        (or shrank) over the phase. "process peak (MB)" is the peak of the
+        whole process up to the end of the phase, not of the phase alone.
+        """
+
+        info(True, "Phase                               wall (s)   cpu (s)  RSS +/- (MB)  process peak (MB)")
+
+        for record in sorted(self._records,
+                             key=lambda record: (record.pid, record.start)):
+            label = "  " * record.depth + record.name
+            if record.section is not None:
+                label += f" [{record.section}]"
+            elif "path" in record.attributes:
+                label += f" [{os.path.basename(record.attributes['path'])}]"
+
+            info(True,
+                 f"{label:<34}{record.wall:>10.3f}{record.cpu:>10.3f}"
+                 f"{record.rss_end_mb - record.rss_start_mb:>14.1f}"
+                 f"{record.process_peak_rss_mb:>19.1f}")
+
+    def write_json(self, path) -> None:
+        """Writes the finished records to a JSON file.
+
+          Raises:
+              IOError:
+                  If the file cannot be written. Handled by the caller.
+          """
+
+        with open(path, "w", encoding="utf-8") as json_file:
+            json.dump([record.to_dict() for record in self._records],
+                      json_file, indent=2)
+
+    def write_chrome_trace(self, path) -> None:
+        """Writes the finished records as a Chrome trace-event JSON file.
+
+          Each phase becomes a complete ("X") event. Phases nest by time
+          within each process and thread, and their section and attributes
+          (row count, bytes written, format ...) become the event's args.
+
+          Raises:
+              IOError:
+                  If the file cannot be written. Handled by the caller.
+          """
+
+        events = []
+        for record in self._records:
+            args = dict(record.attributes, cpu_s=record.cpu,
+                        rss_start_mb=record.rss_start_mb,
+                        rss_end_mb=record.rss_end_mb,
+                        process_peak_rss_mb=record.process_peak_rss_mb)
+            if record.section is not None:
+                args["section"] = record.section
+
+            events.append({
+                "name": record.name if record.section is None
+                else f"{record.name} {record.section}",
+                "cat": "vchkplotter",
+                "ph": "X",
+                # Microseconds.
+                "ts": record.start * 1e6,
+                "dur": record.wall * 1e6,
+                "pid": record.pid,
+                "tid": record.thread,
+                "args": args,
+            })
+
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"},
+                      trace_file)
+
+
+# The profiler used throughout the program.
+PROFILER = Profiler()
+
+
+def phase(name, section=None, **attributes):
+    """`Profiler.phase` of the program-wide `PROFILER`."""
+
+    return PROFILER.phase(name, section, **attributes)
@@ -0,0 +1,224 @@
+# MIT License
+
+# Copyright (c) 2022 Ben.Thornton955@cranfield.ac.uk (ben.thornton@astrazeneca.com)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Summaries of per-sample statistics for cohorts too large to plot
+sample by sample.
+
+The PSC and PSI sections have one row per sample. A bar per sample is
+unreadable (and slow to draw) past a few dozen samples, so above
+`DEFAULT_MAX_SAMPLES` the plotters draw one of these summaries instead.
+Each is a handful of whole-array NumPy operations over a samples x
+statistics array, and its size depends only on the number of statistics
+(and bins), so the cost of drawing it does not grow with the cohort.
+
+Typical usage example:
+
+    values = data_frame[["nhets", "naa"]].to_numpy(dtype=float)
+    quantiles = quantile_summary(values)
+    indices, scores = top_outliers(values)
+    scaled = scale_columns(values)[cluster_order(values)]
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+# Per-sample sections with more samples than this are summarised.
+DEFAULT_MAX_SAMPLES = 60
+
+# Ways of summarising a per-sample section.
+SUMMARY_MODES = ("heatmap", "quantile", "binned")
+
+# Min, 5th, 25th, 50th, 75th and 95th percentile and max.
+SUMMARY_QUANTILES = (0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0)
+
+# Number of bins of consecutive samples in the binned summary.
+DEFAULT_BINS = 200
+
+# Most columns of samples in a heatmap. Past this, neighbouring samples
+# are averaged, so the image (not the cohort) sets the cost of drawing it.
+HEATMAP_COLUMNS = 2000
+
+# Percentiles each statistic is scaled between. See `scale_columns()`.
+SCALE_PERCENTILES = (1, 99)
+
+# Number of most unusual samples to name, per statistic.
+DEFAULT_OUTLIERS = 3
+
+# Samples scoring more than this are outliers. See `outlier_scores()`.
+OUTLIER_SCORE = 3.5
+
+# Scales the median absolute deviation to a standard deviation for
+# normally distributed values.
+MAD_SCALE = 1.4826
+
+
+def quantile_summary(values: np.ndarray,
+                     quantiles=SUMMARY_QUANTILES) -> np.ndarray:
+    """Quantiles of each statistic across all samples.
+
+    Args:
+        values:
+            A samples x statistics array.
+        quantiles:
+            The quantiles to take, between 0 and 1.
+
+    Returns:
+        A quantiles x statistics array.
+    """
+
+    return np.nanquantile(values, quantiles, axis=0)
+
+
+def binned_summary(values: np.ndarray, bins=DEFAULT_BINS
+                   ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Mean and standard deviation of each statistic over bins of
+    consecutive samples.
+
+    Samples are kept in the order of the input, so batches or plates of
+    samples that were sequenced together stay side by side.
+
+    Args:
+        values:
+            A samples x statistics array.
+        bins:
+            The number of bins. There are fewer if there are fewer samples.
+
+    Returns:
+        `(starts, means, deviations)`: the index of the first sample in
+        each bin, then two bins x statistics arrays.
+    """
+
+    samples = len(values)
+    starts = np.unique(np.linspace(0, samples, min(bins, samples) + 1,
+                                   dtype=np.int64)[:-1])
+    counts = np.diff(np.append(starts, samples))[:, np.newaxis]
+
+    means = np.add.reduceat(values, starts, axis=0) / counts
+    squares = np.add.reduceat(np.square(values - np.repeat(means, counts.ravel(),
+                                                           axis=0)),
+                              starts, axis=0)
+
+    return starts, means, np.sqrt(squares / counts)
+
+
+def outlier_scores(values: np.ndarray) -> np.ndarray:
+    """How far each sample is from the rest, per statistic.
+
+    A robust z-score: the distance from the median in (scaled) median
+    absolute deviations, so a few extreme samples do not hide each other.
+    Statistics that barely vary fall back to the plain distance from the
+    median.
+
+    Args:
+        values:
+            A samples x statistics array.
+
+    Returns:
+        A samples x statistics array of scores, 0 at the median.
+    """
+
+    deviations = np.abs(values - np.nanmedian(values, axis=0))
+    spread = MAD_SCALE * np.nanmedian(deviations, axis=0)
+
+    return deviations / np.where(spread > 0, spread, 1)
+
+
+def top_outliers(values: np.ndarray, count=DEFAULT_OUTLIERS
+                 ) -> Tuple[np.ndarray, np.ndarray]:
+    """The most unusual samples of each statistic. See `outlier_scores()`.
+
+    Args:
+        values:
+            A samples x statistics array.
+        count:
+            The number of samples to return per statistic.
+
+    Returns:
+        `(indices, scores)`: two count x statistics arrays, the most
+        unusual sample first. Only samples scoring more than
+        `OUTLIER_SCORE` are really outliers.
+    """
+
+    scores = np.nan_to_num(outlier_scores(values))
+    count = min(count, len(values))
+
+    # Partition rather than sort, as only the top few are wanted.
+    indices = np.argpartition(-scores, count - 1, axis=0)[:count]
+    top = np.take_along_axis(scores, indices, axis=0)
+
+    order = np.argsort(-top, axis=0, kind="stable")
+
+    return (np.take_along_axis(indices, order, axis=0),
+            np.take_along_axis(top, order, axis=0))
+
+
+def scale_columns(values: np.ndarray) -> np.ndarray:
+    """Scales each statistic to between 0 and 1, so statistics counted in
+    millions and in tens can share one colour scale.
+
+    Values are scaled between the 1st and 99th percentile of their
+    statistic (see `SCALE_PERCENTILES`) and clipped, so a few extreme
+    samples do not wash out the rest. Statistics that do not vary are 0.
+
+    Args:
+        values:
+            A samples x statistics array.
+
+    Returns:
+        A samples x statistics array of values between 0 and 1.
+    """
+
+    low, high = np.nanpercentile(values, SCALE_PERCENTILES, axis=0)
+    spread = high - low
+
+    scaled = (values - low) / np.where(spread > 0, spread, 1)
+
+    return np.clip(np.nan_to_num(scaled), 0, 1)
+
+
+def cluster_order(values: np.ndarray) -> np.ndarray:
+    """An order of the samples that puts similar samples side by side.
+
+    Samples are sorted along the direction their (scaled) statistics vary
+    the most, i.e. their first principal component. Unlike hierarchical
+    clustering, which compares every pair of samples, this takes one
+    small SVD, so it scales to any number of samples.
+
+    Args:
+        values:
+            A samples x statistics array.
+
+    Returns:
+        The indices of the samples, in order.
+    """
+
+    scaled = scale_columns(values)
+    centred = scaled - scaled.mean(axis=0)
+
+    _, _, directions = np.linalg.svd(centred, full_matrices=False)
+    direction = directions[0]
+
+    # The sign of a principal component is arbitrary. Fix it, so the same
+    # data is always drawn the same way round.
+    direction *= np.sign(direction[np.argmax(np.abs(direction))])
+
+    return np.argsort(centred @ direction, kind="stable")
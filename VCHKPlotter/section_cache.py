@@ -0,0 +1,217 @@
+# MIT License
+
+# Copyright (c) 2022 Ben.Thornton955@cranfield.ac.uk (ben.thornton@astrazeneca.com)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""On-disk cache of parsed sections.
+
+Each parsed section is stored as one directory of NumPy `.npy` files, one
+per column, alongside the section's raw text. Entries are keyed by the
+content hash of the .vchk file, the section name and the parser version,
+so a changed file or parser never reads a stale entry.
+
+Numeric columns are loaded memory-mapped. Any other column is stored as
+its raw strings (never pickled, so the cache is safe on shared disks)
+and re-typed on load. The least recently used entries are evicted once
+the cache grows past its size limit.
+
+Typical usage example:
+
+    cache = SectionCache("/scratch/vchk-cache", max_bytes=1 << 30)
+    cached = cache.load(digest, "psc", parser_version)
+"""
+
+import json
+import os
+import shutil
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Default size limit of the cache directory, in megabytes.
+DEFAULT_CACHE_SIZE_MB = 1024
+
+# Name of the file that describes a cache entry.
+META_FILE = "meta.json"
+TEXT_FILE = "text.txt"
+
+
+class SectionCache:
+    """A size-limited, least recently used cache of parsed sections.
+
+      Attributes:
+          _directory: Where the cache entries are kept.
+          _max_bytes: The total size the entries may take up.
+      """
+
+    def __init__(self, directory, max_bytes=DEFAULT_CACHE_SIZE_MB << 20) -> None:
+        """Initialises a cache in `directory`, creating it if need be.
+
+          Raises:
+              OSError:
+                  If the directory cannot be created. Handled by the caller.
+          """
+
+        self._directory = directory
+        self._max_bytes = max_bytes
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry(self, digest, name, parser_version) -> str:
+        """Returns the location of a cache entry."""
+        return os.path.join(self._directory,
+                            f"{digest}-{name}-v{parser_version}")
+
+    def load(self, digest, name,
+             parser_version) -> Optional[Tuple[List[str], list, str]]:
+        """Looks up a parsed section.
+
+          Args:
+              digest:
+                  Content hash of the .vchk file.
+              name:
+                  The (lower case) section name. E.g. "psc".
+              parser_version:
+                  Version of the parser that produced the entry.
+
+          Returns:
+              `None` on a miss. Otherwise a tuple of the column names, the
+              columns (a memory-mapped array for numeric columns, otherwise
+              a list of the raw strings) and the raw text of the section.
+          """
+
+        entry = self._entry(digest, name, parser_version)
+
+        try:
+            with open(os.path.join(entry, META_FILE), "r",
+                      encoding="utf-8") as meta_file:
+                meta = json.load(meta_file)
+
+            data_columns = []
+            for position, numeric in enumerate(meta["numeric"]):
+                column_file = os.path.join(entry, f"{position}.npy")
+
+                if numeric:
+                    data_columns.append(np.load(column_file, mmap_mode="r"))
+                else:
+                    data_columns.append(np.load(column_file).tolist())
+
+            with open(os.path.join(entry, TEXT_FILE), "r",
+                      encoding="utf-8", newline="") as text_file:
+                text = text_file.read()
+
+            # Mark the entry as recently used.
+            os.utime(entry)
+
+        except (OSError, ValueError, KeyError):
+            return None
+
+        return meta["columns"], data_columns, text
+
+    def store(self, digest, name, parser_version, columns, data_columns,
+              text) -> None:
+        """Adds a parsed section to the cache, then evicts old entries.
+
+          Args:
+              digest:
+                  Content hash of the .vchk file.
+              name:
+                  The (lower case) section name. E.g. "psc".
+              parser_version:
+                  Version of the parser that produced the section.
+              columns:
+                  The column names.
+              data_columns:
+                  One entry per column. Either a numeric NumPy array or a
+                  list of the column's raw (str) cells.
+              text:
+                  The raw text of the section.
+
+          Raises:
+              OSError:
+                  If the entry cannot be written. Handled by the caller.
+          """
+
+        entry = self._entry(digest, name, parser_version)
+        if os.path.isdir(entry):
+            return
+
+        # Write everything to a temporary directory first and then move it
+        # into place, so other processes never see half an entry.
+        temporary_entry = f"{entry}.{os.getpid()}.tmp"
+        os.makedirs(temporary_entry, exist_ok=True)
+
+        try:
+            numeric = []
+            for position, column in enumerate(data_columns):
+                is_numeric = isinstance(column, np.ndarray)
+                numeric.append(is_numeric)
+
+                np.save(os.path.join(temporary_entry, f"{position}.npy"),
+                        column if is_numeric else np.asarray(column, dtype=str),
+                        allow_pickle=False)
+
+            with open(os.path.join(temporary_entry, TEXT_FILE), "w",
+                      encoding="utf-8", newline="") as text_file:
+                text_file.write(text)
+
+            with open(os.path.join(temporary_entry, META_FILE), "w",
+                      encoding="utf-8") as meta_file:
+                json.dump({"columns": columns, "numeric": numeric}, meta_file)
+
+            try:
+                os.rename(temporary_entry, entry)
+            except OSError:
+                # Another process may have stored the same section first.
+                if not os.path.isdir(entry):
+                    raise
+
+        finally:
+            shutil.rmtree(temporary_entry, ignore_errors=True)
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries until the cache fits
+        within its size limit."""
+
+        entries = []
+        for entry in os.scandir(self._directory):
+            if not entry.is_dir() or entry.name.endswith(".tmp"):
+                continue
+
+            # Other processes may be evicting at the same time.
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(entry.path, file_name))
+                    for file_name in os.listdir(entry.path))
+                entries.append((entry.stat().st_mtime, size, entry.path))
+            except OSError:
+                continue
+
+        total = sum(size for _, size, _ in entries)
+
+        # Oldest first.
+        for _, size, path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
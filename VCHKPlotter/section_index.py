@@ -0,0 +1,355 @@
+# MIT License
+
+# Copyright (c) 2022 Ben.Thornton955@cranfield.ac.uk (ben.thornton@astrazeneca.com)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Byte-offset index of the sections in a .vchk file.
+
+Scans a .vchk file in large binary chunks and records where each
+section (`# SN`, `# DP`, `# PSC` ...) starts and ends, without splitting
+the data rows into fields. Sections that are not needed can then be
+skipped with a seek.
+
+The index can also be kept next to the input file as a sidecar
+(`<file>.vchk.idx`) so repeat runs need not scan the file at all.
+
+Typical usage example:
+
+    with open(in_file, "rb") as stats_file:
+        index = SectionIndex.scan(stats_file)
+        span = index.get("tstv")
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from typing import Iterator, List, Optional
+
+# How many bytes to read from the input at a time.
+CHUNK_SIZE = 1 << 20
+
+# Byte version of `FileHandler.SECTION_HEADER_PATTERN`.
+SECTION_HEADER_PATTERN = re.compile(rb"# (\w+)\t")
+
+# Same as `FileHandler.SECTION_HEADER_CONSTITUENT`.
+SECTION_HEADER_CONSTITUENT = re.compile(r"\[\d+\](.+)")
+
+# Suffix of the sidecar index file and the version of its format. Bump the
+# version whenever the format changes so old sidecars are ignored.
+SIDECAR_SUFFIX = ".idx"
+SIDECAR_VERSION = 2
+
+
+class SectionSpan:
+    """The location of a single section within a .vchk file.
+
+      Attributes:
+          title: The title of the section as written in the file. E.g. "SN".
+          start: Offset of the first byte of the section's header line.
+          data_start: Offset of the first byte of the section's first row.
+          end: Offset one past the last byte of the section's last row.
+          rows: The number of data rows in the section.
+          columns: The cleaned column names from the header line, or `None`
+              if the header line is not in the correct format.
+          virtual_start: The BGZF virtual offset of `start`, if the file is
+              BGZF compressed. See `BgzfReader`.
+      """
+
+    def __init__(self, title, start, data_start, end=None, rows=0,
+                 columns=None, virtual_start=None) -> None:
+        """Initialises a span that starts at `start`."""
+
+        self.title = title
+        self.start = start
+        self.data_start = data_start
+        self.end = end
+        self.rows = rows
+        self.columns = columns
+        self.virtual_start = virtual_start
+
+    @property
+    def name(self) -> str:
+        """The lower case title, as used for the list of actions."""
+        return self.title.lower()
+
+    @property
+    def length(self) -> int:
+        """The number of bytes in this section, header line included."""
+        return self.end - self.start
+
+    def to_dict(self) -> dict:
+        """Returns this span as a JSON-serialisable dict."""
+        return dict(self.__dict__)
+
+    @staticmethod
+    def from_dict(fields) -> "SectionSpan":
+        """Inverse of `.to_dict()`."""
+        return SectionSpan(**fields)
+
+
+def header_columns(header) -> Optional[List[str]]:
+    """Cleans the column names of a header line.
+
+      E.g. "# TSTV\t[2]id\t[3]ts" => ["id", "ts"].
+
+      Args:
+          header:
+              The (str) header line.
+
+      Returns:
+          The list of column names, or `None` if any of them is
+          not in the correct format.
+      """
+
+    columns = []
+    for column in header.split("\t")[1:]:
+        match = SECTION_HEADER_CONSTITUENT.match(column.strip())
+        if match is None:
+            return None
+        columns.append(match.group(1).lower())
+
+    return columns
+
+
+def scan_sections(stream, chunk_size=CHUNK_SIZE,
+                  hasher=None) -> Iterator[SectionSpan]:
+    """Yields the span of each section in a binary stream as it completes.
+
+      Only lines that start with "#" are ever looked at individually.
+      The data rows in between are only counted.
+
+      Args:
+          stream:
+              A binary file object, positioned at the start of the file.
+          chunk_size:
+              How many bytes to read from `stream` at a time.
+          hasher:
+              Optional `hashlib` object that is updated with every chunk.
+
+      Yields:
+          A `SectionSpan` for each section header, once the section's
+          end has been seen.
+      """
+
+    # `buffer` always begins at the start of a line. `offset` is where
+    # `buffer` begins in the stream.
+    buffer = b""
+    offset = 0
+    current = None
+
+    # Take each chunk as it arrives, so a pipe is scanned as it is written.
+    read = getattr(stream, "read1", stream.read)
+
+    while True:
+        chunk = read(chunk_size)
+        at_eof = not chunk
+        if hasher is not None:
+            hasher.update(chunk)
+        buffer += chunk
+        position = 0
+
+        while True:
+            # Find the next comment / header line.
+            if buffer.startswith(b"#", position):
+                hash_at = position
+            else:
+                hash_at = buffer.find(b"\n#", position)
+                hash_at = -1 if hash_at == -1 else hash_at + 1
+
+            if hash_at == -1:
+                break
+
+            line_end = buffer.find(b"\n", hash_at)
+            if line_end == -1 and not at_eof:
+                # Wait for the rest of this line.
+                break
+            line_end = len(buffer) if line_end == -1 else line_end + 1
+
+            # Any "#" line terminates the section before it.
+            if current is not None:
+                current.rows += buffer.count(b"\n", position, hash_at)
+                current.end = offset + hash_at
+                yield current
+                current = None
+
+            match = SECTION_HEADER_PATTERN.match(buffer, hash_at, line_end)
+            if match:
+                header = buffer[hash_at:line_end].decode("utf-8")
+                current = SectionSpan(match.group(1).decode("utf-8"),
+                                      offset + hash_at, offset + line_end,
+                                      columns=header_columns(header))
+
+            position = line_end
+
+        if at_eof:
+            if current is not None:
+                current.rows += buffer.count(b"\n", position)
+                # A last row with no line ending is still a row.
+                if not buffer.endswith(b"\n") and position < len(buffer):
+                    current.rows += 1
+                current.end = offset + len(buffer)
+                yield current
+            return
+
+        # Keep the incomplete last line (or "#" line) for the next chunk.
+        cut = hash_at if hash_at != -1 else max(
+            position, buffer.rfind(b"\n", position) + 1)
+        if current is not None:
+            current.rows += buffer.count(b"\n", position, cut)
+
+        offset += cut
+        buffer = buffer[cut:]
+
+
+class SectionIndex:
+    """An ordered collection of the `SectionSpan`s found in a .vchk file.
+
+      Attributes:
+          _spans: The spans, in the order they appear in the file.
+          _digest: The hex content hash of the file, if it was computed.
+      """
+
+    def __init__(self, spans, digest=None) -> None:
+        """Initialises an index from a list of spans."""
+
+        self._spans = list(spans)
+        self._digest = digest
+
+    @staticmethod
+    def scan(stream, chunk_size=CHUNK_SIZE, digest=False,
+             on_span=None, until=None) -> "SectionIndex":
+        """Builds the index of a binary stream. See `scan_sections`.
+
+          Args:
+              stream:
+                  A binary file object, positioned at the start of the file.
+              chunk_size:
+                  How many bytes to read from `stream` at a time.
+              digest:
+                  Whether to also hash the content of the stream.
+              on_span:
+                  Optional function called with each span as soon as the
+                  section's end has been read.
+              until:
+                  Optional function called with each span after
+                  `on_span`. Scanning stops, leaving the rest of the
+                  stream unread (and unhashed), once it returns `True`.
+          """
+
+        hasher = hashlib.blake2b(digest_size=20) if digest else None
+        spans = []
+        for span in scan_sections(stream, chunk_size, hasher):
+            if on_span is not None:
+                on_span(span)
+            spans.append(span)
+
+            if until is not None and until(span):
+                break
+
+        return SectionIndex(spans,
+                            hasher.hexdigest() if hasher is not None else None)
+
+    @staticmethod
+    def load(path, source_stat) -> Optional["SectionIndex"]:
+        """Loads a sidecar index, as long as it is still valid.
+
+          Args:
+              path:
+                  Location of the sidecar index.
+              source_stat:
+                  `os.stat_result` of the .vchk file the index is for.
+
+          Returns:
+              The index, or `None` if the sidecar does not exist, cannot be
+              read or was written for a different version of the file.
+          """
+
+        try:
+            with open(path, "r", encoding="utf-8") as sidecar:
+                contents = json.load(sidecar)
+
+            if (contents["version"] != SIDECAR_VERSION
+                    or contents["size"] != source_stat.st_size
+                    or contents["mtime_ns"] != source_stat.st_mtime_ns):
+                return None
+
+            return SectionIndex(
+                map(SectionSpan.from_dict, contents["sections"]),
+                contents["hash"])
+
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path, source_stat) -> None:
+        """Writes this index to a sidecar file.
+
+          The file is written under a temporary name first and then moved
+          into place, so a half-written sidecar is never read.
+
+          Args:
+              path:
+                  Where to write the sidecar index.
+              source_stat:
+                  `os.stat_result` of the .vchk file this index is for.
+
+          Raises:
+              OSError:
+                  If the sidecar could not be written. Handled by the caller.
+          """
+
+        contents = {
+            "version": SIDECAR_VERSION,
+            "size": source_stat.st_size,
+            "mtime_ns": source_stat.st_mtime_ns,
+            "hash": self._digest,
+            "sections": [span.to_dict() for span in self._spans],
+        }
+
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary_path, "w", encoding="utf-8") as sidecar:
+                json.dump(contents, sidecar)
+            os.replace(temporary_path, path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    def get(self, name) -> Optional[SectionSpan]:
+        """Returns the (last) span of the section called `name`, if any."""
+
+        spans = [span for span in self._spans if span.name == name]
+
+        return spans[-1] if spans else None
+
+    def names(self) -> List[str]:
+        """Returns the (lower case) names of all sections in the index."""
+
+        return [span.name for span in self._spans]
+
+    def get_digest(self) -> Optional[str]:
+        """Accessor for the content hash of the indexed file."""
+        return self._digest
+
+    def __iter__(self) -> Iterator[SectionSpan]:
+        return iter(self._spans)
+
+    def __len__(self) -> int:
+        return len(self._spans)
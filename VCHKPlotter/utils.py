@@ -38,10 +38,30 @@ Typical usage example:
     `error("Could not find input .vchk file")`
 """
 
+import html
+import json
+import os
 import sys
 
 from termcolor import colored
 
+# Block size for copying files when the OS cannot copy for us.
+COPY_BLOCK_SIZE = 1 << 20
+
+# Web page listing the pages of a section. See `write_page_index`.
+PAGE_INDEX_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>img {{ width: 100%; }}</style>
+</head>
+<body>
+<h1>{title}</h1>
+{figures}</body>
+</html>
+"""
+
 
 def warn(verbosity, message) -> None:
     """Warns the user (in yellow) of a non-critical issue in their inputs. E.g. superfluous inputs.
@@ -56,6 +76,20 @@ def warn(verbosity, message) -> None:
         print(colored(f"Warning! {message}", "yellow"), file=sys.stderr)
 
 
+def info(verbosity, message) -> None:
+    """Tells the user (in cyan) about the progress of the program. E.g. how
+    long a plot took to save.
+
+    Args:
+        verbosity:
+            `bool`. Only print to stderr if this is `True`.
+        message:
+            The message to print.
+    """
+    if verbosity:
+        print(colored(message, "cyan"), file=sys.stderr)
+
+
 def error(message) -> None:
     """Informs the user (in red) of a critical issue. E.g. no input file
     detected or cannot parse command-line arguments. This message will
@@ -95,3 +129,120 @@ def write_as_text(out_dir, file_name, text) -> None:
 
     except IOError:
         error(f"Could not write to file {out_dir}/{file_name}.txt")
+
+
+def write_as_bytes(out_dir, file_name, data) -> None:
+    """Writes the raw bytes of a .vchk section to a singular .txt file.
+
+    Same as `write_as_text`, for a section that has not been decoded.
+
+    Args:
+        out_dir:
+            Where to place the containing folder.
+        file_name:
+            The name of the newly created file. Typically the name of
+            the section in lower-case.
+        data:
+            The bytes to write to the file.
+    """
+
+    try:
+        with open(f"{out_dir}/{file_name}/{file_name}.txt", "wb") as file_to_write:
+            file_to_write.write(data)
+
+    except IOError:
+        error(f"Could not write to file {out_dir}/{file_name}.txt")
+
+
+def write_page_index(out_dir, file_name, pages) -> None:
+    """Writes an index of the pages a section was plotted as.
+
+    The index is written both as JSON (`<file_name>_pages.json`) and as a
+    web page showing every page (`<file_name>_pages.html`), next to the
+    pages themselves.
+
+    Args:
+        out_dir:
+            Where the containing folder is.
+        file_name:
+            The name of the section. Typically in lower-case.
+        pages:
+            One dict per page, with its "page" number, the id of its "set"
+            (`None` unless the section has more than one), image "file",
+            number of "samples" and "first_sample" and "last_sample".
+    """
+
+    folder = f"{out_dir}/{file_name}"
+    title = f"{file_name.upper()}: {len(pages)} pages"
+
+    figures = ""
+    for page in pages:
+        caption = f"Page {page['page']}"
+        if page["set"] is not None:
+            caption += f", set {page['set']}"
+
+        figures += (
+            f'<figure><a href="{html.escape(page["file"])}">'
+            f'<img src="{html.escape(page["file"])}" loading="lazy"></a>'
+            f'<figcaption>{html.escape(caption)}: '
+            f'{html.escape(page["first_sample"])} to '
+            f'{html.escape(page["last_sample"])}</figcaption></figure>\n'
+        )
+
+    try:
+        with open(f"{folder}/{file_name}_pages.json",
+                  "w", encoding="utf-8") as index:
+            json.dump({"section": file_name, "pages": pages}, index, indent=1)
+
+        with open(f"{folder}/{file_name}_pages.html",
+                  "w", encoding="utf-8") as index:
+            index.write(PAGE_INDEX_HTML.format(title=html.escape(title),
+                                               figures=figures))
+
+    except IOError:
+        error(f"Could not write the index of {folder}")
+
+
+def copy_byte_range(source, offset, length, destination_path) -> None:
+    """Copies `length` bytes from `offset` in a file to a new file.
+
+    Lets the kernel copy the bytes (`os.copy_file_range`) where possible
+    and falls back to a buffered copy otherwise.
+
+    Args:
+        source:
+            The file to copy from, opened in binary mode.
+        offset:
+            Where in `source` to start copying from.
+        length:
+            The number of bytes to copy.
+        destination_path:
+            The file to create (or overwrite) with the bytes.
+
+    Raises:
+        IOError:
+            If the destination cannot be written. Handled by the caller.
+    """
+
+    with open(destination_path, "wb") as destination:
+        remaining = length
+
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(
+                    source.fileno(), destination.fileno(), remaining,
+                    offset + length - remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+
+        except (AttributeError, OSError):
+            # Not supported on this platform or between these file systems.
+            source.seek(offset + length - remaining)
+
+            while remaining > 0:
+                block = source.read(min(remaining, COPY_BLOCK_SIZE))
+                if not block:
+                    break
+                destination.write(block)
+                remaining -= len(block)
@@ -13,10 +13,13 @@ setup(
     long_description=io.open("README.md", encoding="utf-8").read(),
     packages=["VCHKPlotter"],
     install_requires=[
-        'termcolor<=2.0.1', 'mne<=0.23.0', 'matplotlib>=3.3.2',
+        'termcolor<=2.0.1', 'matplotlib>=3.8.0',
         'seaborn>=0.11.0', 'numpy>=1.17.0rc1', 'pandas>=1.5.0'
     ],
     entry_points={
-        'console_scripts': ["VCHKPlotter=VCHKPlotter.__main__:main"]
+        'console_scripts': [
+            "VCHKPlotter=VCHKPlotter.__main__:main",
+            "VCHKPlotter-batch=VCHKPlotter.batch:main"
+        ]
     },
 )
@@ -28,7 +28,11 @@ import pandas as pd
 import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
-from mne.viz import plot_connectivity_circle
+from matplotlib import colormaps
+from matplotlib.cm import ScalarMappable
+from matplotlib.collections import PathCollection
+from matplotlib.colors import Normalize
+from matplotlib.path import Path
 
 from utils import warn
 
@@ -56,6 +60,134 @@ plt.rcParams["figure.figsize"] = 15, 10
 logging.getLogger("matplotlib.font_manager").disabled = True
 
 
+def draw_chord_circle(axis, matrix, node_names, node_angles, node_colors,
+                      colormap="hot", textcolor="black", node_edgecolor="black",
+                      linewidth=1.5, title=None, fontsize_title=12,
+                      fontsize_names=8, fontsize_colorbar=8):
+    """Draws a circular chord plot of the connections between some nodes.
+
+    Draws the same plot as `mne.viz.plot_connectivity_circle` did for the
+    lower triangle of a square matrix: each connection is a Bezier curve
+    between two nodes on a ring, coloured by its strength, with a colour
+    bar next to the ring. All the curves are drawn as one `PathCollection`.
+
+    Args:
+        axis:
+            The polar axis to draw on.
+        matrix:
+            The square matrix of connection strengths. Only the lower
+            triangle is drawn. NaN means there is no connection.
+        node_names:
+            The label of each node.
+        node_angles:
+            Where each node is on the ring, in degrees.
+        node_colors:
+            The colour of each node.
+        colormap:
+            The name of the colormap that colours the connections.
+        textcolor:
+            The colour of the labels, title and colour bar labels.
+        node_edgecolor:
+            The colour of the borders between the nodes.
+        linewidth:
+            The width of the connections.
+        title:
+            The title of the plot, if any.
+        fontsize_title, fontsize_names, fontsize_colorbar:
+            The font sizes of the title, node labels and colour bar labels.
+    """
+
+    n_nodes = len(node_names)
+    node_angles = np.asarray(node_angles) * np.pi / 180
+
+    # Each node is as wide as the smallest gap between two of them.
+    gaps = np.abs(node_angles[None, :] - node_angles[:, None])
+    gaps[np.diag_indices(n_nodes)] = np.inf
+    node_width = gaps.min()
+
+    # The connections, weakest first so the strongest are drawn on top.
+    starts, ends = np.tril_indices(n_nodes, -1)
+    strengths = np.asarray(matrix)[starts, ends]
+    drawn = ~np.isnan(strengths)
+    starts, ends, strengths = starts[drawn], ends[drawn], strengths[drawn]
+
+    order = np.argsort(np.abs(strengths))
+    starts, ends, strengths = starts[order], ends[order], strengths[order]
+
+    # Spread the ends of the connections of busy nodes out a little, the
+    # first (weakest) connections the most. Seeded so plots are repeatable.
+    rng = np.random.mtrand.RandomState(0)
+    noise_max = 0.25 * node_width
+    start_noise = rng.uniform(-noise_max, noise_max, len(strengths))
+    end_noise = rng.uniform(-noise_max, noise_max, len(strengths))
+
+    # How many connections each node has, and how many of them have been
+    # seen after each connection, counting both of its ends.
+    both_ends = np.column_stack([starts, ends]).ravel()
+    seen = np.cumsum(both_ends[:, None] == np.arange(n_nodes), axis=0)[1::2]
+    n_connections = seen[-1] if len(seen) else np.zeros(n_nodes, dtype=int)
+    connection = np.arange(len(strengths))
+
+    start_noise *= (n_connections[starts] - seen[connection, starts]) \
+        / n_connections[starts]
+    end_noise *= (n_connections[ends] - seen[connection, ends]) \
+        / n_connections[ends]
+
+    # A curve from the inside of the ring at one node, bending towards the
+    # middle, to the inside of the ring at the other.
+    start_angles = node_angles[starts] + start_noise
+    end_angles = node_angles[ends] + end_noise
+    vertices = np.stack([
+        np.column_stack([start_angles, np.full_like(start_angles, 10)]),
+        np.column_stack([start_angles, np.full_like(start_angles, 5)]),
+        np.column_stack([end_angles, np.full_like(end_angles, 5)]),
+        np.column_stack([end_angles, np.full_like(end_angles, 10)]),
+    ], axis=1)
+    codes = [Path.MOVETO, Path.CURVE4, Path.CURVE4, Path.LINETO]
+
+    cmap = colormaps[colormap]
+    norm = Normalize(strengths.min(), strengths.max())
+
+    axis.set_xticks([])
+    axis.set_yticks([])
+    axis.set_ylim(0, 16)
+    axis.spines["polar"].set_visible(False)
+
+    axis.add_collection(PathCollection(
+        [Path(curve, codes) for curve in vertices],
+        facecolors="none",
+        edgecolors=cmap(norm(strengths)),
+        linewidths=linewidth,
+    ))
+
+    # The ring of nodes.
+    axis.bar(node_angles, np.ones(n_nodes), width=node_width, bottom=9,
+             edgecolor=node_edgecolor, lw=2.0, color=node_colors,
+             align="center")
+
+    for name, angle in zip(node_names, node_angles):
+        rotation = np.degrees(angle)
+        alignment = "left"
+        if rotation < 270:
+            # Flip the label, so text is always upright.
+            rotation += 180
+            alignment = "right"
+
+        axis.text(angle, 10.4, name, size=fontsize_names, rotation=rotation,
+                  rotation_mode="anchor", horizontalalignment=alignment,
+                  verticalalignment="center", color=textcolor)
+
+    if title is not None:
+        axis.set_title(title, color=textcolor, fontsize=fontsize_title)
+
+    mappable = ScalarMappable(norm=norm, cmap=cmap)
+    mappable.set_array(np.linspace(norm.vmin, norm.vmax))
+    colorbar = axis.figure.colorbar(mappable, ax=axis, use_gridspec=False,
+                                    shrink=0.2, anchor=(-0.3, 0.1))
+    colorbar.ax.tick_params(labelsize=fontsize_colorbar,
+                            labelcolor=textcolor)
+
+
 class DataPlotter(ABC):
     """Models common styling parameters and saving functionality for some
     abstract graph.
@@ -256,24 +388,25 @@ class SubstitutionPlotter(DataPlotter):
         node_angles = np.array(list(first) + list(second))
 
         # Produce the plot.
-        fig, _ = plot_connectivity_circle(
+        fig = plt.figure(figsize=(8, 8), facecolor="White")
+        axis = fig.add_subplot(polar=True, facecolor="White")
+        draw_chord_circle(
+            axis,
             data,
             names,
+            node_angles,
+            # Group the purine / pyrmidine pairs.
+            ["Orange", "Orange", "Purple", "Purple"] * 2,
             textcolor="black",
             # The stronger the shade of Red - the more frequent the
             # substitution type.
             colormap="Reds",
-            facecolor="White",
-            node_angles=node_angles,
-            # Group the purine / pyrmidine pairs.
-            node_colors=["Orange", "Orange", "Purple", "Purple"] * 2,
             linewidth=4,
             title="""Chord Plot to Show Frequency of Nucleobase\nSubstitution 
                 Types. Read from Left to Right. \n\n Colour is Relationship 
                 Strength\n(Frequency of Substitution Type)""",
             fontsize_names=12,
             node_edgecolor="White",
-            show=False
         )
 
         self._figure = fig